@@ -4,16 +4,37 @@ FastAPI server for Campaign Generator with WebSocket support
 This is the main entry point for the campaign generation API.
 """
 
+import os
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api import websocket_endpoint
+from src.mcp.http_client import aclose_client
+from src.utils.llm_utils import aclose_llm_http_client
+from src.utils.llm_cache import aclose_llm_cache
+
+# Workflow progress is logged through `logging`; LOG_LEVEL=DEBUG adds per-list detail
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(message)s")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release the shared Frederick API, LLM and LLM cache connections on shutdown"""
+    yield
+    await aclose_client()
+    await aclose_llm_http_client()
+    await aclose_llm_cache()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Campaign Generator API",
     description="AI-powered marketing campaign generation using LangChain and LangGraph",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for React frontend
@@ -63,4 +84,6 @@ async def websocket_route(websocket: WebSocket, client_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True)
+    # Messages are small JSON frames; per-connection permessage-deflate costs
+    # more CPU and memory than it saves on the wire
+    uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True, ws_per_message_deflate=False)
@@ -4,24 +4,16 @@ MCP Server for Frederick Campaigns API
 Provides tools to interact with Frederick's campaigns.
 """
 
-import os
-import json
+import asyncio
 from typing import Optional, Dict, Any
-import httpx
 from mcp.server.fastmcp import FastMCP
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from .http_client import api_request, json_dumps
+from .response_cache import cached_response, invalidate
 
 # Initialize MCP server
 mcp = FastMCP("Frederick Campaigns")
 
-# Configuration
-FREDERICK_API_BASE = os.getenv("FREDERICK_API_BASE", "https://api.staging.hirefrederick.com/v2")
-FREDERICK_API_KEY = os.getenv("FREDERICK_API_KEY")
-FREDERICK_BEARER_TOKEN = os.getenv("FREDERICK_BEARER_TOKEN")
-
 
 @mcp.tool()
 async def create_campaign(
@@ -50,36 +42,6 @@ async def create_campaign(
         On success: {"success": True, "data": {...}, "message": "..."}
         On error: {"error": "...", "message": "...", "status_code": ...}
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/campaigns"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "content-type": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     # Construct request body following JSON:API specification
     # Ensure campaign name starts with "AI - " but avoid duplicates
     campaign_name = name if name.startswith("AI - ") else f"AI - {name}"
@@ -96,35 +58,24 @@ async def create_campaign(
         "meta": None
     }
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "success": True,
-                "data": data.get("data", {}),
-                "message": f"Campaign '{name}' created successfully"
-            }
-            
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
+    def on_success(data: dict) -> dict:
+        # The location's campaign emails have changed
+        invalidate(location_id)
         return {
-            "error": "Unexpected error",
-            "message": str(e)
+            "success": True,
+            "data": data.get("data", {}),
+            "message": f"Campaign '{name}' created successfully"
         }
+    
+    return await api_request(
+        "POST",
+        f"/locations/{location_id}/campaigns",
+        json_payload=payload,
+        success_transform=on_success,
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
@@ -158,36 +109,6 @@ async def schedule_campaign(
         On success: {"success": True, "data": {...}, "message": "..."}
         On error: {"error": "...", "message": "...", "status_code": ...}
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/campaigns/{campaign_id}"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "content-type": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     # Construct request body matching the working curl format
     # Status must be 'scheduled' to move from draft
     # Contact lists are 'name' attribute values (not 'display_name') in attributes
@@ -208,35 +129,19 @@ async def schedule_campaign(
         "meta": None
     }
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(url, headers=headers, json=payload, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "success": True,
-                "data": data.get("data", {}),
-                "message": f"Campaign scheduled successfully for {send_at}"
-            }
-            
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "message": str(e)
-        }
+    return await api_request(
+        "PATCH",
+        f"/locations/{location_id}/campaigns/{campaign_id}",
+        json_payload=payload,
+        success_transform=lambda data: {
+            "success": True,
+            "data": data.get("data", {}),
+            "message": f"Campaign scheduled successfully for {send_at}"
+        },
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
@@ -266,36 +171,6 @@ async def create_email_document(
         On success: {"success": True, "data": {...}, "message": "..."}
         On error: {"error": "...", "message": "...", "status_code": ...}
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/email_documents"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "content-type": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     # Construct request body following JSON:API specification
     payload = {
         "data": {
@@ -309,35 +184,23 @@ async def create_email_document(
         "meta": None
     }
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "success": True,
-                "data": data.get("data", {}),
-                "message": f"Email document created successfully for campaign {campaign_id}"
-            }
-            
-    except httpx.HTTPStatusError as e:
+    def on_success(data: dict) -> dict:
+        invalidate(location_id)
         return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "message": str(e)
+            "success": True,
+            "data": data.get("data", {}),
+            "message": f"Email document created successfully for campaign {campaign_id}"
         }
+    
+    return await api_request(
+        "POST",
+        f"/locations/{location_id}/email_documents",
+        json_payload=payload,
+        success_transform=on_success,
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
@@ -367,36 +230,6 @@ async def update_email_document(
         On success: {"success": True, "data": {...}, "message": "..."}
         On error: {"error": "...", "message": "...", "status_code": ...}
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/email_documents/{email_document_id}"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "content-type": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     # Construct request body following JSON:API specification
     payload = {
         "data": {
@@ -410,38 +243,23 @@ async def update_email_document(
         "meta": None
     }
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.patch(url, headers=headers, json=payload, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "success": True,
-                "data": data.get("data", {}),
-                "message": f"Email document updated successfully"
-            }
-            
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "message": str(e)
-        }
+    return await api_request(
+        "PATCH",
+        f"/locations/{location_id}/email_documents/{email_document_id}",
+        json_payload=payload,
+        success_transform=lambda data: {
+            "success": True,
+            "data": data.get("data", {}),
+            "message": "Email document updated successfully"
+        },
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
+@cached_response(ttl=120.0, stale_ttl=600.0, location_param="source_location_id")
 async def get_social_profile_links(
     source_platform: Optional[str] = None,
     source_location_id: Optional[str] = None,
@@ -467,76 +285,32 @@ async def get_social_profile_links(
         On success: {"success": True, "data": [...]}
         On error: {"error": "...", "message": "...", "status_code": ...}
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/social_profile_links"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     # Add X-Universal-Customer header if source information is provided
+    extra_headers = None
     if source_platform and source_location_id and source_customer_id:
-        import json
         universal_customer = {
             "source_platform": source_platform,
             "source_location_id": source_location_id,
             "source_customer_id": source_customer_id
         }
-        headers["X-Universal-Customer"] = json.dumps(universal_customer)
+        extra_headers = {"X-Universal-Customer": json_dumps(universal_customer)}
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "success": True,
-                "data": data.get("data", [])
-            }
-            
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "message": str(e)
-        }
+    return await api_request(
+        "GET",
+        "/social_profile_links",
+        extra_headers=extra_headers,
+        success_transform=lambda data: {
+            "success": True,
+            "data": data.get("data", [])
+        },
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
+@cached_response(ttl=120.0, stale_ttl=600.0)
 async def get_latest_campaign_emails(
     location_id: str,
     api_key: Optional[str] = None,
@@ -558,80 +332,34 @@ async def get_latest_campaign_emails(
         On success: {"success": True, "htmls": [{"campaign_name": "...", "subject_line": "...", "html": "..."}]}
         On error: {"error": "...", "message": "...", "status_code": ...}
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/email_documents/latest_custom_html_emails"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
-    # Set pagination parameters to get only 2 latest emails
-    params = {
-        "page[size]": 2
-    }
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=params, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract only essential fields (HTML + minimal context)
-            htmls = []
-            for email_doc in data.get("data", []):
-                attrs = email_doc.get("attributes", {})
-                html = attrs.get("html", "")
-                if html:  # Only include if HTML exists
-                    htmls.append({
-                        "campaign_name": attrs.get("campaign_name", "Untitled"),
-                        "subject_line": attrs.get("subject_line", ""),
-                        "html": html
-                    })
-            
-            return {
-                "success": True,
-                "htmls": htmls
-            }
-            
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "message": str(e)
-        }
+    def extract_htmls(data: dict) -> dict:
+        # Extract only essential fields (HTML + minimal context)
+        htmls = []
+        for email_doc in data.get("data", []):
+            attrs = email_doc.get("attributes", {})
+            html = attrs.get("html", "")
+            if html:  # Only include if HTML exists
+                htmls.append({
+                    "campaign_name": attrs.get("campaign_name", "Untitled"),
+                    "subject_line": attrs.get("subject_line", ""),
+                    "html": html
+                })
+        
+        return {
+            "success": True,
+            "htmls": htmls
+        }
+    
+    return await api_request(
+        "GET",
+        f"/locations/{location_id}/email_documents/latest_custom_html_emails",
+        # Set pagination parameters to get only 2 latest emails
+        params={"page[size]": 2},
+        success_transform=extract_htmls,
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
@@ -670,35 +398,6 @@ async def get_offerings(
             "metadata": {...}
         }
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/offerings"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     # Build query parameters
     params = {}
     if source:
@@ -709,39 +408,24 @@ async def get_offerings(
         params["filter.source_location_id"] = source_location_id
     if interaction_filter:
         # Convert interaction filter dict to JSON string
-        params["filter.interaction"] = json.dumps(interaction_filter)
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=params, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "success": True,
-                "data": data.get("data", [])
-            }
-            
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "message": str(e)
-        }
+        params["filter.interaction"] = json_dumps(interaction_filter)
+    
+    return await api_request(
+        "GET",
+        "/offerings",
+        params=params,
+        success_transform=lambda data: {
+            "success": True,
+            "data": data.get("data", [])
+        },
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
+@cached_response(ttl=300.0, stale_ttl=3600.0)
 async def get_merge_tags(
     location_id: str,
     api_key: Optional[str] = None,
@@ -763,64 +447,59 @@ async def get_merge_tags(
         On success: {"success": True, "data": [...]}
         On error: {"error": "...", "message": "...", "status_code": ...}
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/merge_tags"
+    return await api_request(
+        "GET",
+        f"/locations/{location_id}/merge_tags",
+        success_transform=lambda data: {
+            "success": True,
+            "data": data.get("data", []),
+            "message": f"Retrieved {len(data.get('data', []))} merge tags"
+        },
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
+
+
+async def fetch_location_context(
+    location_id: str,
+    source_platform: Optional[str] = None,
+    source_location_id: Optional[str] = None,
+    source_customer_id: Optional[str] = None,
+    api_key: Optional[str] = None,
+    bearer_token: Optional[str] = None,
+    api_url: Optional[str] = None
+) -> tuple:
+    """
+    Fetch social profile links, latest campaign emails and merge tags for a
+    location concurrently. The requests are independent, so they run as
+    parallel streams on the shared connection instead of one after another.
     
-    headers = {
-        "accept": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
+    Args:
+        location_id: Frederick location ID
+        source_platform: Source platform (e.g., "booker", "mindbody")
+        source_location_id: Source location ID
+        source_customer_id: Source customer ID
+        api_key: Frederick API key (optional, uses env var if not provided)
+        bearer_token: Frederick bearer token (optional, uses env var if not provided)
+        api_url: Frederick API base URL (optional, uses env var if not provided)
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "success": True,
-                "data": data.get("data", []),
-                "message": f"Retrieved {len(data.get('data', []))} merge tags"
-            }
-            
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "message": str(e)
-        }
+    Returns:
+        Tuple of (social_links_result, emails_result, merge_tags_result), each
+        in the same format as the corresponding tool
+    """
+    auth = {"api_key": api_key, "bearer_token": bearer_token, "api_url": api_url}
+    
+    return tuple(await asyncio.gather(
+        get_social_profile_links(
+            source_platform=source_platform,
+            source_location_id=source_location_id,
+            source_customer_id=source_customer_id,
+            **auth
+        ),
+        get_latest_campaign_emails(location_id, **auth),
+        get_merge_tags(location_id, **auth)
+    ))
 
 
 if __name__ == "__main__":
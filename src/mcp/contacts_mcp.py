@@ -4,23 +4,15 @@ MCP Server for Frederick Contacts API
 Provides tools to interact with Frederick's contact lists and smart lists.
 """
 
-import os
 from typing import Optional
-import httpx
 from mcp.server.fastmcp import FastMCP
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from .http_client import api_request
+from .response_cache import cached_response, invalidate
 
 # Initialize MCP server
 mcp = FastMCP("Frederick Contacts")
 
-# Configuration
-FREDERICK_API_BASE = os.getenv("FREDERICK_API_BASE", "https://api.staging.hirefrederick.com/v2")
-FREDERICK_API_KEY = os.getenv("FREDERICK_API_KEY")
-FREDERICK_BEARER_TOKEN = os.getenv("FREDERICK_BEARER_TOKEN")
-
 
 @mcp.tool()
 async def update_smart_list(
@@ -47,26 +39,6 @@ async def update_smart_list(
     Returns:
         Dictionary with success/error information
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key or not _bearer_token:
-        return {"error": "API credentials not configured", "message": "Please provide API credentials."}
-    
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/contact_lists/{list_id}"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "content-type": "application/vnd.api+json",
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     payload = {
         "data": {
             "type": "contact_lists",
@@ -79,29 +51,27 @@ async def update_smart_list(
         "meta": None
     }
     
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.patch(url, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                return {
-                    "success": True,
-                    "data": response.json(),
-                    "message": "Smart list updated successfully"
-                }
-            else:
-                return {
-                    "error": f"HTTP {response.status_code}",
-                    "message": response.text,
-                    "status_code": response.status_code
-                }
-    except httpx.TimeoutException:
-        return {"error": "Request timeout", "message": "The request to Frederick API timed out after 30 seconds"}
-    except Exception as e:
-        return {"error": "Request failed", "message": str(e)}
+    def on_success(data: dict) -> dict:
+        invalidate(location_id, tool="get_existing_smart_lists")
+        return {
+            "success": True,
+            "data": data,
+            "message": "Smart list updated successfully"
+        }
+    
+    return await api_request(
+        "PATCH",
+        f"/locations/{location_id}/contact_lists/{list_id}",
+        json_payload=payload,
+        success_transform=on_success,
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
+@cached_response(ttl=300.0, stale_ttl=3600.0)
 async def get_contact_properties(
     location_id: str,
     page_size: int = 1000,
@@ -141,71 +111,28 @@ async def get_contact_properties(
             "total": 42
         }
     """
-    # Use provided credentials or fall back to environment variables
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/contact_properties"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     params = {
         "page.size": page_size,
         "page.number": page_number
     }
     
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "data": data.get("data", []),
-                    "total": len(data.get("data", [])),
-                    "meta": data.get("meta", {})
-                }
-            else:
-                return {
-                    "error": f"HTTP {response.status_code}",
-                    "message": response.text,
-                    "status_code": response.status_code
-                }
-    except httpx.TimeoutException:
-        return {
-            "error": "Request timeout",
-            "message": "The request to Frederick API timed out after 30 seconds"
-        }
-    except Exception as e:
-        return {
-            "error": "Request failed",
-            "message": str(e)
-        }
+    return await api_request(
+        "GET",
+        f"/locations/{location_id}/contact_properties",
+        params=params,
+        success_transform=lambda data: {
+            "data": data.get("data", []),
+            "total": len(data.get("data", [])),
+            "meta": data.get("meta", {})
+        },
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
+@cached_response(ttl=60.0, stale_ttl=60.0)
 async def get_existing_smart_lists(
     location_id: str, 
     page_size: int = 1000,
@@ -217,6 +144,9 @@ async def get_existing_smart_lists(
     Fetch all smart lists (contact lists with list_type='smart') for a specific location.
     Returns only smart lists with filtered fields: name, display_name, filters
     
+    Results are cached per location for 60 seconds; creating or updating a
+    smart list drops the cached entry.
+    
     Args:
         location_id: The Frederick location ID to fetch smart lists for
         page_size: Number of results per page (default: 1000)
@@ -241,87 +171,44 @@ async def get_existing_smart_lists(
             "total_all_lists": 10
         }
     """
-    # Use provided credentials or fall back to environment variables
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/contact_lists"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     params = {
         "page.size": page_size
     }
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=params, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Filter for smart lists only and extract specified fields
-            all_lists = data.get("data", [])
-            smart_lists = []
-            
-            for item in all_lists:
-                attrs = item.get("attributes", {})
-                
-                # Only include smart lists
-                if attrs.get("list_type") == "smart":
-                    smart_lists.append({
-                        "id": item.get("id"),
-                        "attributes": {
-                            "name": attrs.get("name"),
-                            "display_name": attrs.get("display_name"),
-                            "filters": attrs.get("filters")
-                        }
-                    })
+    def extract_smart_lists(data: dict) -> dict:
+        # Filter for smart lists only and extract specified fields
+        all_lists = data.get("data", [])
+        smart_lists = []
+        
+        for item in all_lists:
+            attrs = item.get("attributes", {})
             
-            return {
-                "data": smart_lists,
-                "total_smart_lists": len(smart_lists),
-                "total_all_lists": len(all_lists)
-            }
-            
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
+            # Only include smart lists
+            if attrs.get("list_type") == "smart":
+                smart_lists.append({
+                    "id": item.get("id"),
+                    "attributes": {
+                        "name": attrs.get("name"),
+                        "display_name": attrs.get("display_name"),
+                        "filters": attrs.get("filters")
+                    }
+                })
+        
         return {
-            "error": "Unexpected error",
-            "message": str(e)
+            "data": smart_lists,
+            "total_smart_lists": len(smart_lists),
+            "total_all_lists": len(all_lists)
         }
+    
+    return await api_request(
+        "GET",
+        f"/locations/{location_id}/contact_lists",
+        params=params,
+        success_transform=extract_smart_lists,
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 @mcp.tool()
 async def create_smart_list(
@@ -350,37 +237,6 @@ async def create_smart_list(
         [[{"filter_type": "interaction", "interaction_type": "booked_appointment", 
            "operator": "has_interaction", "communication_type": "Email"}]]
     """
-    # Use provided credentials or fall back to environment variables
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
-        return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
-        }
-    
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/contact_lists"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "content-type": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
     # Construct request body following JSON:API specification
     payload = {
         "data": {
@@ -394,38 +250,27 @@ async def create_smart_list(
         "meta": None
     }
     
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                "success": True,
-                "data": data.get("data", {}),
-                "message": f"Smart list '{display_name}' created successfully"
-            }
-            
-    except httpx.HTTPStatusError as e:
+    def on_success(data: dict) -> dict:
+        invalidate(location_id, tool="get_existing_smart_lists")
         return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "message": str(e)
+            "success": True,
+            "data": data.get("data", {}),
+            "message": f"Smart list '{display_name}' created successfully"
         }
+    
+    return await api_request(
+        "POST",
+        f"/locations/{location_id}/contact_lists",
+        json_payload=payload,
+        success_transform=on_success,
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 @mcp.tool()
+@cached_response(ttl=300.0, stale_ttl=3600.0)
 async def get_interaction_types(
     location_id: str,
     api_key: Optional[str] = None,
@@ -446,71 +291,28 @@ async def get_interaction_types(
         On success: {"success": True, "interaction_types": ["type1", "type2", ...]}
         On error: {"error": "...", "message": "..."}
     """
-    _api_key = api_key or FREDERICK_API_KEY
-    _bearer_token = bearer_token or FREDERICK_BEARER_TOKEN
-    _api_base = api_url or FREDERICK_API_BASE
-    
-    if not _api_key:
+    def extract_names(data: dict) -> dict:
+        # Extract only the names to save context window tokens
+        interaction_type_names = []
+        for item in data.get("data", []):
+            attrs = item.get("attributes", {})
+            name = attrs.get("name")
+            if name:
+                interaction_type_names.append(name)
+        
         return {
-            "error": "FREDERICK_API_KEY not configured",
-            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
+            "success": True,
+            "interaction_types": interaction_type_names
         }
     
-    if not _bearer_token:
-        return {
-            "error": "FREDERICK_BEARER_TOKEN not configured",
-            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
-        }
-    
-    # Ensure URL has /v2 path if not already present
-    if not _api_base.endswith('/v2'):
-        _api_base = f"{_api_base}/v2"
-    
-    url = f"{_api_base}/locations/{location_id}/interaction_types"
-    
-    headers = {
-        "accept": "application/vnd.api+json",
-        "authorization": f"Bearer {_bearer_token}",
-        "x-api-key": _api_key,
-        "user-agent": "Frederick-Campaign-Generator/1.0"
-    }
-    
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract only the names to save context window tokens
-            interaction_type_names = []
-            for item in data.get("data", []):
-                attrs = item.get("attributes", {})
-                name = attrs.get("name")
-                if name:
-                    interaction_type_names.append(name)
-            
-            return {
-                "success": True,
-                "interaction_types": interaction_type_names
-            }
-            
-    except httpx.HTTPStatusError as e:
-        return {
-            "error": "HTTP error",
-            "status_code": e.response.status_code,
-            "message": str(e),
-            "response": e.response.text
-        }
-    except httpx.RequestError as e:
-        return {
-            "error": "Request error",
-            "message": str(e)
-        }
-    except Exception as e:
-        return {
-            "error": "Unexpected error",
-            "message": str(e)
-        }
+    return await api_request(
+        "GET",
+        f"/locations/{location_id}/interaction_types",
+        success_transform=extract_names,
+        api_key=api_key,
+        bearer_token=bearer_token,
+        api_url=api_url
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,330 @@
+"""
+Shared HTTP client and request configuration for Frederick API calls made
+by the MCP tools
+
+A single AsyncClient keeps connections (and their TLS sessions) alive
+between tool calls instead of paying a fresh handshake on every request.
+Base URL and headers that don't change between calls are built once here.
+"""
+
+import os
+import importlib.util
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional
+import httpx
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+FREDERICK_API_BASE = os.getenv("FREDERICK_API_BASE", "https://api.staging.hirefrederick.com/v2")
+FREDERICK_API_KEY = os.getenv("FREDERICK_API_KEY")
+FREDERICK_BEARER_TOKEN = os.getenv("FREDERICK_BEARER_TOKEN")
+
+# Fail fast on unreachable hosts or an exhausted pool, but leave reads room
+# for slow responses (e.g. large HTML documents)
+FREDERICK_HTTP_TIMEOUT = httpx.Timeout(
+    connect=float(os.getenv("FREDERICK_HTTP_CONNECT_TIMEOUT", "1.0")),
+    read=float(os.getenv("FREDERICK_HTTP_READ_TIMEOUT", "30.0")),
+    write=float(os.getenv("FREDERICK_HTTP_WRITE_TIMEOUT", "5.0")),
+    pool=float(os.getenv("FREDERICK_HTTP_POOL_TIMEOUT", "1.0"))
+)
+
+# Keep idle connections long enough to survive an LLM generation step between calls
+FREDERICK_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("FREDERICK_HTTP_KEEPALIVE_EXPIRY", "60.0"))
+
+# orjson encodes/decodes several times faster than the stdlib and works on
+# bytes directly; fall back to json if it isn't installed
+try:
+    import orjson
+
+    def json_dumps(obj) -> str:
+        """Serialize obj to a JSON string"""
+        return orjson.dumps(obj).decode()
+
+    def json_body(obj) -> bytes:
+        """Serialize obj to a JSON request body"""
+        return orjson.dumps(obj)
+
+    json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def json_dumps(obj) -> str:
+        """Serialize obj to a JSON string"""
+        return json.dumps(obj, separators=(",", ":"))
+
+    def json_body(obj) -> bytes:
+        """Serialize obj to a JSON request body"""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    json_loads = json.loads
+
+# HTTP/2 needs the optional h2 package (installed via httpx[http2])
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared AsyncClient, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient with HTTP/2 (when available) and keep-alive pooling
+    """
+    global _CLIENT
+
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=FREDERICK_HTTP_KEEPALIVE_EXPIRY
+            ),
+            timeout=FREDERICK_HTTP_TIMEOUT
+        )
+
+    return _CLIENT
+
+
+async def aclose_client():
+    """Close the shared AsyncClient, if it was created"""
+    global _CLIENT
+
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+async def prewarm(api_url: Optional[str] = None):
+    """
+    Open (or refresh) a pooled connection to the Frederick API so the TCP/TLS
+    handshake is off the critical path of the next real request.
+
+    Args:
+        api_url: Frederick API base URL (optional, uses env var if not provided)
+    """
+    try:
+        await get_client().head(_normalize_base(api_url), timeout=2.0)
+    except httpx.HTTPError:
+        # Best effort; the real request will connect on its own
+        pass
+
+
+def _with_v2(api_base: str) -> str:
+    """Ensure URL has /v2 path if not already present"""
+    return api_base if api_base.endswith("/v2") else f"{api_base}/v2"
+
+
+@dataclass(frozen=True, slots=True)
+class FrederickConfig:
+    """Credentials and /v2 base URL used for a Frederick API call"""
+    api_key: Optional[str]
+    bearer_token: Optional[str]
+    api_base: str
+
+
+# Resolved once at import; only per-call overrides build a new config
+_CONFIG = FrederickConfig(FREDERICK_API_KEY, FREDERICK_BEARER_TOKEN, _with_v2(FREDERICK_API_BASE))
+DEFAULT_API_BASE = _CONFIG.api_base
+
+
+@lru_cache(maxsize=32)
+def _override_base(api_url: str) -> str:
+    return _with_v2(api_url)
+
+
+def _normalize_base(api_url: Optional[str]) -> str:
+    """Return the /v2 base URL for a call (the env default unless overridden)"""
+    return _override_base(api_url) if api_url else DEFAULT_API_BASE
+
+# No explicit accept-encoding: httpx already advertises every decoder it has
+# (gzip, deflate, plus br with the brotli extra), so payloads such as
+# latest_custom_html_emails come back compressed and are decoded transparently
+STATIC_HEADERS = {
+    "accept": "application/vnd.api+json",
+    "user-agent": "Frederick-Campaign-Generator/1.0"
+}
+
+JSON_API_CONTENT_TYPE = "application/vnd.api+json"
+
+
+def _build_headers(api_key: str, bearer_token: str, with_body: bool) -> dict:
+    headers = {
+        **STATIC_HEADERS,
+        "authorization": f"Bearer {bearer_token}",
+        "x-api-key": api_key
+    }
+    if with_body:
+        headers["content-type"] = JSON_API_CONTENT_TYPE
+    return headers
+
+
+# Headers for the env-configured credentials, reused whenever a call doesn't override them
+_DEFAULT_HEADERS = {
+    with_body: _build_headers(_CONFIG.api_key, _CONFIG.bearer_token, with_body)
+    for with_body in (False, True)
+} if _CONFIG.api_key and _CONFIG.bearer_token else {}
+
+
+def resolve_auth(
+    api_key: Optional[str] = None,
+    bearer_token: Optional[str] = None,
+    api_url: Optional[str] = None,
+    with_body: bool = False
+) -> tuple:
+    """
+    Resolve credentials and base URL for a request, falling back to env vars.
+
+    Args:
+        api_key: Frederick API key (optional, uses env var if not provided)
+        bearer_token: Frederick bearer token (optional, uses env var if not provided)
+        api_url: Frederick API base URL (optional, uses env var if not provided)
+        with_body: Whether the request sends a JSON:API body (adds content-type)
+
+    Returns:
+        Tuple of (headers, api_base, error). On success error is None; otherwise
+        headers and api_base are None and error is the dict to return from the tool.
+    """
+    # Fast path: no overrides and env credentials already validated
+    if not (api_key or bearer_token or api_url) and _DEFAULT_HEADERS:
+        return _DEFAULT_HEADERS[with_body], _CONFIG.api_base, None
+
+    cfg = FrederickConfig(
+        api_key or _CONFIG.api_key,
+        bearer_token or _CONFIG.bearer_token,
+        _normalize_base(api_url)
+    )
+
+    if not cfg.api_key:
+        return None, None, {
+            "error": "FREDERICK_API_KEY not configured",
+            "message": "Please provide api_key parameter or set FREDERICK_API_KEY in .env file"
+        }
+
+    if not cfg.bearer_token:
+        return None, None, {
+            "error": "FREDERICK_BEARER_TOKEN not configured",
+            "message": "Please provide bearer_token parameter or set FREDERICK_BEARER_TOKEN in .env file"
+        }
+
+    if cfg.api_key == _CONFIG.api_key and cfg.bearer_token == _CONFIG.bearer_token and _DEFAULT_HEADERS:
+        headers = _DEFAULT_HEADERS[with_body]
+    else:
+        headers = _build_headers(cfg.api_key, cfg.bearer_token, with_body)
+
+    return headers, cfg.api_base, None
+
+
+# Upper bound on the error body copied into a tool result (e.g. a proxy's HTML error page)
+MAX_ERROR_BODY_BYTES = 4096
+
+_ERR_HTTP = {"error": "HTTP error"}
+_ERR_REQUEST = {"error": "Request error"}
+_ERR_INVALID_BODY = {"error": "Invalid response"}
+
+
+def _error_body(response: httpx.Response) -> str:
+    """Decode at most MAX_ERROR_BODY_BYTES of an error response body"""
+    body = response.content
+    if len(body) <= MAX_ERROR_BODY_BYTES:
+        return body.decode(response.encoding or "utf-8", errors="replace")
+    return body[:MAX_ERROR_BODY_BYTES].decode(response.encoding or "utf-8", errors="replace") + "...[truncated]"
+
+
+def _format_error(e: Exception) -> dict:
+    """
+    Build the tool error result for a failed Frederick API call.
+
+    Args:
+        e: HTTPStatusError or another httpx error raised by the request
+
+    Returns:
+        {"error": "...", "message": "...", ...} as returned by the MCP tools
+    """
+    if isinstance(e, httpx.HTTPStatusError):
+        return {
+            **_ERR_HTTP,
+            "status_code": e.response.status_code,
+            "message": str(e),
+            "response": _error_body(e.response)
+        }
+    if isinstance(e, httpx.TimeoutException):
+        return {**_ERR_REQUEST, "message": f"Timed out: {type(e).__name__}"}
+    if isinstance(e, httpx.ConnectError):
+        return {**_ERR_REQUEST, "message": f"Could not connect to {e.request.url.host}"}
+    return {**_ERR_REQUEST, "message": str(e)}
+
+
+def _default_success(data: dict) -> dict:
+    return {"success": True, "data": data.get("data", {})}
+
+
+async def api_request(
+    method: str,
+    path: str,
+    *,
+    api_key: Optional[str] = None,
+    bearer_token: Optional[str] = None,
+    api_url: Optional[str] = None,
+    json_payload: Optional[dict] = None,
+    params: Optional[dict] = None,
+    extra_headers: Optional[dict] = None,
+    success_transform: Optional[Callable[[dict], dict]] = None
+) -> dict:
+    """
+    Send a request to the Frederick API on the shared client.
+
+    Handles credential resolution, URL assembly, JSON encoding/decoding and
+    error formatting so each tool only describes its own request.
+
+    Args:
+        method: HTTP method ("GET", "POST", "PATCH", ...)
+        path: Path below the /v2 base URL (e.g. "/locations/{id}/campaigns")
+        api_key: Frederick API key (optional, uses env var if not provided)
+        bearer_token: Frederick bearer token (optional, uses env var if not provided)
+        api_url: Frederick API base URL (optional, uses env var if not provided)
+        json_payload: JSON:API request body, if any
+        params: Query parameters
+        extra_headers: Headers to add on top of the auth headers
+        success_transform: Builds the tool result from the decoded response body
+            (default: {"success": True, "data": body["data"]})
+
+    Returns:
+        Result of success_transform on success.
+        On error: {"error": "...", "message": "...", "status_code": ...}
+    """
+    headers, api_base, error = resolve_auth(
+        api_key, bearer_token, api_url, with_body=json_payload is not None
+    )
+    if error:
+        return error
+
+    if extra_headers:
+        headers = {**headers, **extra_headers}
+
+    try:
+        response = await get_client().request(
+            method,
+            f"{api_base}{path}",
+            headers=headers,
+            params=params,
+            content=json_body(json_payload) if json_payload is not None else None
+        )
+        response.raise_for_status()
+        try:
+            data = json_loads(response.content)
+        except ValueError as e:
+            return {**_ERR_INVALID_BODY, "message": str(e)}
+
+        return (success_transform or _default_success)(data)
+
+    except httpx.HTTPError as e:
+        return _format_error(e)
+    except Exception as e:
+        # Tools always return a result dict (e.g. a bad api_url or an unexpected body shape)
+        return {"error": "Unexpected error", "message": str(e)}
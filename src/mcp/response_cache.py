@@ -0,0 +1,178 @@
+"""
+In-process response cache with stale-while-revalidate for Frederick API GET tools
+
+Fresh entries are returned directly. Stale entries (past ttl but within
+stale_ttl) are returned immediately while a background refresh updates them,
+so warm callers never wait on the network. Concurrent misses for the same key
+share a single in-flight request. Error results are never cached.
+"""
+
+import time
+import asyncio
+import inspect
+import logging
+import functools
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Maximum cached responses; the least recently used are dropped first
+MAX_ENTRIES = 1024
+
+# key -> (expires_at, stale_until, result), in LRU order; keys are (tool, location, arguments)
+_CACHE: OrderedDict = OrderedDict()
+
+# Keys with a background refresh in flight, and the tasks doing it
+_REFRESHING: Set[tuple] = set()
+_REFRESH_TASKS: Set[asyncio.Task] = set()
+
+# key -> task fetching it, so concurrent misses await one request
+_INFLIGHT: Dict[tuple, asyncio.Task] = {}
+
+# key -> number of fetches (including refreshes) running for it
+_RUNNING: Dict[tuple, int] = {}
+
+# key -> number of times it was invalidated while fetches for it were running.
+# A fetch only stores its result if the generation hasn't changed since it started
+_GENERATIONS: Dict[tuple, int] = {}
+
+
+def _begin(key: tuple) -> int:
+    """Register a running fetch and return the generation it was started in"""
+    _RUNNING[key] = _RUNNING.get(key, 0) + 1
+    return _GENERATIONS.get(key, 0)
+
+
+def _end(key: tuple):
+    """Unregister a finished fetch; generations are only kept while fetches run"""
+    if _RUNNING[key] > 1:
+        _RUNNING[key] -= 1
+    else:
+        del _RUNNING[key]
+        _GENERATIONS.pop(key, None)
+
+
+def _store(key: tuple, result: Any, ttl: float, stale_ttl: float, generation: int):
+    """Cache a successful result, unless the key was invalidated since it was fetched"""
+    if isinstance(result, dict) and "error" in result:
+        return
+    if _GENERATIONS.get(key, 0) != generation:
+        return
+
+    now = time.monotonic()
+    _CACHE[key] = (now + ttl, now + stale_ttl, result)
+    _CACHE.move_to_end(key)
+
+    if len(_CACHE) > MAX_ENTRIES:
+        # Purge expired entries first, then the least recently used
+        for old_key in [k for k, entry in _CACHE.items() if entry[1] <= now]:
+            del _CACHE[old_key]
+        while len(_CACHE) > MAX_ENTRIES:
+            _CACHE.popitem(last=False)
+
+
+def cached_response(ttl: float = 60.0, stale_ttl: float = 300.0, location_param: Optional[str] = "location_id"):
+    """
+    Decorator adding stale-while-revalidate caching to an async GET tool.
+
+    The cache key is the tool name plus all bound arguments (including
+    credentials, so tenants never share entries).
+
+    Args:
+        ttl: Seconds an entry is served as fresh
+        stale_ttl: Seconds an entry may be served stale while it is refreshed
+        location_param: Argument holding the location the response belongs to,
+            matched by invalidate(location_id=...); None if it has none
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        if location_param is not None and location_param not in signature.parameters:
+            raise ValueError(f"{func.__name__} has no '{location_param}' argument")
+
+        async def refresh(key: tuple, args, kwargs):
+            generation = _begin(key)
+            try:
+                _store(key, await func(*args, **kwargs), ttl, stale_ttl, generation)
+            except Exception as e:
+                # Nobody awaits a background refresh; the stale entry stays until it expires
+                logger.warning("✗ Background refresh of %s failed: %s", key[0], e)
+            finally:
+                _end(key)
+                _REFRESHING.discard(key)
+
+        async def fetch(key: tuple, args, kwargs):
+            generation = _begin(key)
+            try:
+                result = await func(*args, **kwargs)
+                _store(key, result, ttl, stale_ttl, generation)
+            finally:
+                _end(key)
+            return result
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            location = bound.arguments.get(location_param) if location_param else None
+            key = (func.__name__, location, tuple(bound.arguments.items()))
+
+            try:
+                entry = _CACHE.get(key)
+            except TypeError:
+                # Unhashable arguments, don't cache
+                return await func(*args, **kwargs)
+
+            if entry is not None:
+                expires_at, stale_until, result = entry
+                now = time.monotonic()
+                if now < expires_at:
+                    _CACHE.move_to_end(key)
+                    return result
+                if now < stale_until:
+                    _CACHE.move_to_end(key)
+                    if key not in _REFRESHING:
+                        _REFRESHING.add(key)
+                        task = asyncio.create_task(refresh(key, args, kwargs))
+                        _REFRESH_TASKS.add(task)
+                        task.add_done_callback(_REFRESH_TASKS.discard)
+                    return result
+                del _CACHE[key]
+
+            task = _INFLIGHT.get(key)
+            if task is None:
+                task = asyncio.create_task(fetch(key, args, kwargs))
+                _INFLIGHT[key] = task
+                task.add_done_callback(lambda done: _INFLIGHT.pop(key) if _INFLIGHT.get(key) is done else None)
+
+            # Shield so one cancelled caller doesn't cancel the request for the others
+            return await asyncio.shield(task)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(location_id: Optional[str] = None, tool: Optional[str] = None):
+    """
+    Drop cached responses for a location and/or tool (or everything if neither given).
+
+    Fetches already in flight for those keys don't store their (now outdated)
+    results, and later callers start a new request instead of joining them.
+
+    Args:
+        location_id: Location whose entries should be dropped, matched against
+            each tool's declared location argument
+        tool: Name of the cached tool whose entries should be dropped
+    """
+    def matches(key: tuple) -> bool:
+        if tool is not None and key[0] != tool:
+            return False
+        return location_id is None or key[1] == location_id
+
+    for key in [k for k in _CACHE if matches(k)]:
+        del _CACHE[key]
+
+    for key in [k for k in _RUNNING if matches(k)]:
+        _GENERATIONS[key] = _GENERATIONS.get(key, 0) + 1
+        _INFLIGHT.pop(key, None)
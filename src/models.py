@@ -3,17 +3,43 @@ Data models and state definitions for campaign generation workflow
 """
 
 from typing import TypedDict
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ParsedPrompt(BaseModel):
     """Structured output for parsed campaign prompt"""
     audience: str = Field(description="Target audience criteria (e.g., contacts in New York who visited studio)")
     template: str = Field(description="Campaign content details (e.g., 30% discount on Black Friday promotion)")
-    datetime: str = Field(description="Scheduled date and time (e.g., 30th November 9AM)")
-    smart_list_name: str = Field(default="", description="Short name for the smart list (e.g., 'AI - NYC Studio Members')")
+    datetime: str = Field(description="Scheduled date and time in ISO 8601 format with the location's timezone offset (e.g., 2025-11-28T14:15:00+05:30)")
     image_search_queries: list[str] = Field(default=[], description="1-2 focused search queries for finding relevant images (e.g., ['yoga class studio', 'fitness workout'])")
-    missing_info: list[str] = Field(description="List of missing or ambiguous information that needs clarification")
+    missing_info: list[str] = Field(description="Up to 3 most critical missing or ambiguous items that need clarification; empty list if information is sufficient")
+
+
+class ImageAnalysis(BaseModel):
+    """Structured output for deciding whether an email change needs new stock images"""
+    needs_images: bool = Field(description="Whether the user wants to add, change, or update images")
+    search_query: str = Field(default="", description="Focused 2-4 word stock image search query if needs_images is true, otherwise empty")
+
+
+class ListMatch(BaseModel):
+    """A smart list matched against the audience description"""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    id: str = Field(description="ID of the matching smart list")
+    relevance_score: float = Field(default=0.0, description="How well the list matches the audience (0-1)")
+    reason: str = Field(default="", description="Why this list matches")
+
+
+class MatchResult(BaseModel):
+    """Structured output for smart list matching"""
+    matches: list[ListMatch] = Field(default=[], description="Up to 3 best matching lists")
+    has_matches: bool = Field(default=False, description="Whether any list matches the audience")
+
+
+class EmailMetaResult(BaseModel):
+    """Structured output for campaign name and subject line generation"""
+    campaign_name: str = Field(description="Descriptive internal campaign name in plain text (no merge tags), starting with 'AI - '")
+    subject_line: str = Field(description="Email subject line in plain text (no merge tags), under 60 characters")
 
 
 class CampaignState(TypedDict):
@@ -38,6 +64,8 @@ class CampaignState(TypedDict):
     schedule_confirmed: bool
     clarifications_needed: list[str]
     clarification_responses: dict[str, str]  # Store user's clarification answers
+    clarification_context: str  # Clarification Q/A pairs as JSON lines, appended each round
+    prompt_context: dict  # current_date/location_context bound once per request for the parse/update prompts
     creation_attempts: int  # Number of times we've tried to create the smart list
     last_error: str  # Last error message from smart list creation
     current_step: str
@@ -3,109 +3,401 @@ Workflow nodes for campaign generation
 """
 
 import os
+import json
 import asyncio
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.prompts import ChatPromptTemplate
-from .models import CampaignState, ParsedPrompt
-from .prompts import PARSE_PROMPT_TEMPLATE, UPDATE_PROMPT_TEMPLATE
+import hashlib
+import logging
+from collections import OrderedDict
+from .models import CampaignState, ParsedPrompt, MatchResult
+from .prompts import PARSE_PROMPT_TEMPLATE, UPDATE_PROMPT_TEMPLATE, SMART_LIST_MATCHING_PROMPT
 from .utils.location_utils import format_location_context
+from .utils.llm_cache import cached_llm_call
 
+# Imported once at module load; None if the MCP tools aren't available
+try:
+    from .mcp.contacts_mcp import get_existing_smart_lists
+except ImportError:
+    get_existing_smart_lists = None
 
-def parse_prompt(state: CampaignState, llm, location: dict = None) -> dict:
-    """Parse user prompt into audience, template, and datetime components"""
-    print(f"\n[Parsing prompt...]")
+logger = logging.getLogger(__name__)
+
+
+# ParsedPrompt's JSON schema, reflected once. Structured output is given the
+# schema (not the class) so streaming yields progressively-complete dicts;
+# the final dict is validated into ParsedPrompt by the nodes.
+_PARSED_PROMPT_SCHEMA = ParsedPrompt.model_json_schema()
+
+# Chains are pure and reusable, so build each (template, llm) pair once.
+# The llm is kept in the entry so its id() can't be reused by another object.
+# LLMs may be built per client, so only the most recently used chains are kept
+# (a weak mapping wouldn't help: each chain holds its llm strongly).
+_CHAINS: OrderedDict = OrderedDict()
+MAX_CACHED_CHAINS = 64
+
+
+def _cached_chain(prompt, llm, build):
+    """Return the cached chain for (prompt, llm), building it on first use"""
+    key = (id(prompt), id(llm))
+    entry = _CHAINS.get(key)
+    if entry is None:
+        entry = (llm, build())
+        _CHAINS[key] = entry
+        while len(_CHAINS) > MAX_CACHED_CHAINS:
+            _CHAINS.popitem(last=False)
+    else:
+        _CHAINS.move_to_end(key)
+    return entry[1]
+
+
+def _parsed_prompt_chain(prompt, llm):
+    """Return the cached `prompt | structured llm` chain producing ParsedPrompt dicts"""
+    return _cached_chain(
+        prompt, llm,
+        lambda: prompt | llm.with_structured_output(_PARSED_PROMPT_SCHEMA)
+    )
+
+
+def _match_chain(llm):
+    """
+    Return the cached smart list matching chain for this llm.
+    Provider-side structured output returns a validated MatchResult,
+    no text parsing needed.
+    """
+    return _cached_chain(
+        SMART_LIST_MATCHING_PROMPT, llm,
+        lambda: SMART_LIST_MATCHING_PROMPT | llm.with_structured_output(MatchResult)
+    )
+
+
+def _summarize_filter(f) -> str:
+    """Render one FredQL filter as a short `field op value` string"""
+    if not isinstance(f, dict):
+        return str(f)
+    
+    filter_type = f.get("filter_type")
+    operator = f.get("operator", "")
+    
+    if filter_type == "contact_property":
+        parts = [f.get("property_name", ""), operator]
+        if f.get("value") not in (None, ""):
+            parts.append(str(f["value"]))
+        return " ".join(parts)
+    
+    if filter_type == "interaction":
+        types = f.get("interaction_type", "")
+        if isinstance(types, list):
+            types = "|".join(types)
+        parts = [operator, types]
+        for key, label in (
+            ("last_occurred_within_minutes_ago", "within_min"),
+            ("first_occurred_within_minutes_ago", "first_within_min"),
+            ("occurred_before", "before"),
+            ("occurred_at_or_after", "since"),
+            ("min_occurrences", "min"),
+            ("max_occurrences", "max")
+        ):
+            if f.get(key) not in (None, ""):
+                parts.append(f"{label}={f[key]}")
+        for meta in f.get("metadata") or []:
+            meta_parts = [meta.get("key", ""), meta.get("operator", "")]
+            if meta.get("value") not in (None, ""):
+                meta_parts.append(str(meta["value"]))
+            parts.append(f"[{' '.join(meta_parts)}]")
+        return " ".join(parts)
+    
+    if filter_type == "contact_list":
+        return f"{operator} {f.get('list_name', '')}"
+    
+    return ",".join(f"{k}={v}" for k, v in f.items())
+
+
+# Maximum filter terms rendered per smart list in the matching prompt
+MAX_FILTER_TERMS = 5
+
+
+def _summarize_filters(filters, max_terms: int = MAX_FILTER_TERMS) -> str:
+    """
+    Render FredQL filters compactly for the matching prompt.
+    Inner arrays are ANDed and outer elements ORed, as in FredQL.
+    At most max_terms filters are rendered; the rest are counted.
+    """
+    filters = filters or []
+    if all(isinstance(f, dict) for f in filters):
+        # Flat list of filters: a single AND group
+        filters = [filters] if filters else []
     
-    # Create parser and chain
-    parser = JsonOutputParser(pydantic_object=ParsedPrompt)
-    chain = PARSE_PROMPT_TEMPLATE | llm | parser
+    groups = []
+    rendered = skipped = 0
+    for group in filters:
+        items = group if isinstance(group, list) else [group]
+        room = max_terms - rendered
+        if room <= 0:
+            skipped += len(items)
+            continue
+        skipped += max(len(items) - room, 0)
+        items = items[:room]
+        rendered += len(items)
+        groups.append(" AND ".join(_summarize_filter(f) for f in items))
     
-    # Get current date for context
+    summary = " OR ".join(f"({g})" if " AND " in g and len(groups) > 1 else g for g in groups) or "none"
+    if skipped:
+        summary += f" ...(+{skipped} more filters)"
+    return summary
+
+
+# Number of smart lists kept by the embedding prefilter before LLM matching
+# (0, the default, disables the prefilter and sends the first 50 lists instead;
+# enabling it loads a sentence-transformers model into the server process)
+SMART_LIST_PREFILTER_TOP_K = int(os.getenv("SMART_LIST_PREFILTER_TOP_K", "0"))
+
+# location_id -> (catalog digest, normalized float32 list embedding matrix), in LRU order
+_LIST_EMBEDDINGS: OrderedDict = OrderedDict()
+MAX_CACHED_LIST_EMBEDDINGS = 256
+
+
+async def _prefilter_lists(location_id: str, audience: str, lists: list[dict]) -> list[dict]:
+    """
+    Keep the SMART_LIST_PREFILTER_TOP_K lists most similar to the audience,
+    so the matching LLM only scores a handful of candidates.
+    
+    Args:
+        location_id: Location the lists belong to (embeddings are cached per location)
+        audience: Audience description
+        lists: List descriptions with id, name, display_name and filters
+        
+    Returns:
+        The most similar lists, best first (the first 50 lists if embeddings are unavailable)
+    """
+    top_k = SMART_LIST_PREFILTER_TOP_K
+    if top_k <= 0 or len(lists) <= top_k or not audience:
+        return lists[:50]
+    
+    texts = [
+        f"{l['name']} | {l['display_name']} | {_summarize_filters(l['filters'])}"
+        for l in lists
+    ]
+    digest = hashlib.sha256("\n".join(
+        f"{l['id']}:{text}" for l, text in zip(lists, texts)
+    ).encode()).hexdigest()
+    
+    try:
+        import numpy as np
+        from .utils.embedding_utils import get_embedder
+        
+        # The first call imports torch and loads the model, keep it off the event loop
+        embedder = await asyncio.to_thread(get_embedder)
+        cached = _LIST_EMBEDDINGS.get(location_id)
+        if cached is not None and cached[0] == digest:
+            matrix = cached[1]
+            _LIST_EMBEDDINGS.move_to_end(location_id)
+        else:
+            matrix = np.asarray(await embedder.embed_documents(texts), dtype=np.float32)
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+            _LIST_EMBEDDINGS[location_id] = (digest, matrix)
+            _LIST_EMBEDDINGS.move_to_end(location_id)
+            while len(_LIST_EMBEDDINGS) > MAX_CACHED_LIST_EMBEDDINGS:
+                _LIST_EMBEDDINGS.popitem(last=False)
+        
+        query = np.asarray(await embedder.embed_query(audience), dtype=np.float32)
+        scores = matrix @ query
+        top = np.argsort(-scores)[:top_k]
+    except Exception as e:
+        logger.info("✗ Smart list prefilter unavailable, sending first 50 lists: %s", e)
+        return lists[:50]
+    
+    logger.info("✓ Prefiltered %d smart lists to %d candidates", len(lists), len(top))
+    return [lists[i] for i in top]
+
+
+async def _stream_parsed(chain, inputs: dict, send_message=None) -> dict:
+    """
+    Stream a JSON-producing chain, forwarding each progressively-complete
+    dict to the client as it is generated.
+    
+    Args:
+        chain: Runnable streaming progressively-complete dicts
+        inputs: Prompt variables for the chain
+        send_message: Optional async function to send messages via WebSocket
+        
+    Returns:
+        The final parsed dict
+    """
+    result = None
+    async for partial in chain.astream(inputs):
+        result = partial
+        if send_message:
+            await send_message({
+                "type": "partial",
+                "delta": partial,
+                "timestamp": asyncio.get_event_loop().time(),
+                "disable_input": True
+            })
+    return result
+
+
+def format_clarification(question: str, answer: str) -> str:
+    """Render one clarification Q/A pair as a compact JSON line for the update prompt"""
+    return json.dumps({"q": question, "a": answer}, ensure_ascii=False, separators=(",", ":"))
+
+
+def prompt_context(location: dict = None) -> dict:
+    """
+    Build the per-request prompt variables shared by the parse and update prompts.
+    
+    Computed once per campaign request and kept in the state, so every
+    clarification round sees the same date and location text (and hits the
+    same cache entries) instead of re-rendering them per call.
+    
+    Args:
+        location: Location details
+        
+    Returns:
+        {"current_date": ..., "location_context": ...}
+    """
     from datetime import datetime
-    current_date = datetime.now().strftime("%A, %B %d, %Y")
     
-    # Format location context
-    location_context = format_location_context(location)
+    return {
+        "current_date": datetime.now().strftime("%A, %B %d, %Y"),
+        "location_context": format_location_context(location)
+    }
+
+
+async def parse_prompt(state: CampaignState, llm, location: dict = None, send_message=None) -> dict:
+    """Parse user prompt into audience, template, and datetime components"""
+    logger.info("[Parsing prompt...]")
+    
+    chain = _parsed_prompt_chain(PARSE_PROMPT_TEMPLATE, llm)
+    
+    # Date and location context, bound once for the whole request
+    context = state.get("prompt_context") or prompt_context(location)
     
     try:
-        result = chain.invoke({
-            "prompt": state["user_prompt"],
-            "current_date": current_date,
-            "location_context": location_context
-        })
+        inputs = {"prompt": state["user_prompt"], **context}
+        result = await cached_llm_call(
+            llm, PARSE_PROMPT_TEMPLATE, inputs,
+            lambda: _stream_parsed(chain, inputs, send_message)
+        )
+        
+        # Structured output streams plain dicts (needed for partial streaming);
+        # validate the final one once and use the model from here on
+        parsed = ParsedPrompt.model_validate(result)
         
-        print(f"✓ Extracted: Audience, Template, DateTime")
-        if result['missing_info']:
-            print(f"  {len(result['missing_info'])} clarification(s) needed")
+        logger.info("✓ Extracted: Audience, Template, DateTime")
+        if parsed.missing_info:
+            logger.info("  %d clarification(s) needed", len(parsed.missing_info))
         
         return {
-            "audience": result["audience"],
-            "template": result["template"],
-            "datetime": result["datetime"],
-            "smart_list_name": result.get("smart_list_name", ""),
-            "image_search_queries": result.get("image_search_queries", []),
-            "clarifications_needed": result["missing_info"],
+            "audience": parsed.audience,
+            "template": parsed.template,
+            "datetime": parsed.datetime,
+            "image_search_queries": parsed.image_search_queries,
+            "clarifications_needed": parsed.missing_info,
+            "prompt_context": context,
             "current_step": "clarify_ambiguity"
         }
     except Exception as e:
-        print(f"✗ Error parsing prompt: {e}")
+        logger.warning("✗ Error parsing prompt: %s", e)
         return {
             "clarifications_needed": [f"Failed to parse prompt: {str(e)}"],
+            "prompt_context": context,
             "current_step": "parse_prompt"
         }
 
 
-def process_clarifications(state: CampaignState, llm, location: dict = None) -> dict:
+async def parse_prompts(prompts: list, llm, location: dict = None, max_concurrency: int = 10) -> list:
+    """
+    Parse several campaign prompts concurrently (e.g. for bulk imports).
+    
+    Args:
+        prompts: User campaign prompts
+        llm: Chat model to parse with
+        location: Location details shared by all prompts
+        max_concurrency: Maximum LLM requests in flight at once
+        
+    Returns:
+        One result per prompt, in order: the same state update parse_prompt
+        returns, or {"error": "...", "message": "..."} if that prompt failed
+    """
+    chain = _parsed_prompt_chain(PARSE_PROMPT_TEMPLATE, llm)
+    context = prompt_context(location)
+    
+    results = await chain.abatch(
+        [{"prompt": prompt, **context} for prompt in prompts],
+        config={"max_concurrency": max_concurrency},
+        return_exceptions=True
+    )
+    
+    updates = []
+    for result in results:
+        try:
+            if isinstance(result, Exception):
+                raise result
+            parsed = ParsedPrompt.model_validate(result)
+        except Exception as e:
+            updates.append({"error": "Failed to parse prompt", "message": str(e)})
+            continue
+        updates.append({
+            "audience": parsed.audience,
+            "template": parsed.template,
+            "datetime": parsed.datetime,
+            "image_search_queries": parsed.image_search_queries,
+            "clarifications_needed": parsed.missing_info,
+            "current_step": "clarify_ambiguity"
+        })
+    
+    logger.info("✓ Parsed %d prompt(s), %d failed", len(updates), sum("error" in u for u in updates))
+    return updates
+
+
+async def process_clarifications(state: CampaignState, llm, location: dict = None, send_message=None) -> dict:
     """
     Process user's clarification responses and update the campaign state.
     Re-parse or refine the audience, template, and datetime based on clarifications.
     """
-    print(f"\n[Processing clarifications...]")
+    logger.info("[Processing clarifications...]")
     
-    # Build a context from clarifications
-    clarification_context = "\n".join([
-        f"Q: {q}\nA: {a}" 
+    # Context is appended to as answers come in; rebuild only if it is missing
+    clarification_context = state.get("clarification_context") or "\n".join(
+        format_clarification(q, a)
         for q, a in state["clarification_responses"].items()
-    ])
-    
-    # Create parser and chain
-    parser = JsonOutputParser(pydantic_object=ParsedPrompt)
-    chain = UPDATE_PROMPT_TEMPLATE | llm | parser
+    )
     
-    # Get current date for context
-    from datetime import datetime
-    current_date = datetime.now().strftime("%A, %B %d, %Y")
+    chain = _parsed_prompt_chain(UPDATE_PROMPT_TEMPLATE, llm)
     
-    # Format location context
-    location_context = format_location_context(location)
+    # Reuse the date and location context bound when the prompt was parsed
+    context = state.get("prompt_context") or prompt_context(location)
     
     try:
-        result = chain.invoke({
+        inputs = {
             "audience": state.get("audience", ""),
             "template": state.get("template", ""),
             "datetime": state.get("datetime", ""),
             "clarifications": clarification_context,
-            "current_date": current_date,
-            "location_context": location_context
-        })
+            **context
+        }
+        result = await cached_llm_call(
+            llm, UPDATE_PROMPT_TEMPLATE, inputs,
+            lambda: _stream_parsed(chain, inputs, send_message)
+        )
+        parsed = ParsedPrompt.model_validate(result)
         
-        print(f"✓ Campaign details updated")
+        logger.info("✓ Campaign details updated")
         
-        if result['missing_info']:
-            print(f"  Still need {len(result['missing_info'])} clarification(s)")
+        if parsed.missing_info:
+            logger.info("  Still need %d clarification(s)", len(parsed.missing_info))
         else:
-            print(f"  All information complete!")
+            logger.info("  All information complete!")
         
         return {
-            "audience": result["audience"],
-            "template": result["template"],
-            "datetime": result["datetime"],
-            "smart_list_name": result.get("smart_list_name", ""),
-            "image_search_queries": result.get("image_search_queries", []),
-            "clarifications_needed": result["missing_info"],
+            "audience": parsed.audience,
+            "template": parsed.template,
+            "datetime": parsed.datetime,
+            "image_search_queries": parsed.image_search_queries,
+            "clarifications_needed": parsed.missing_info,
             "current_step": "check_clarifications"
         }
     except Exception as e:
-        print(f"✗ Error processing clarifications: {e}")
+        logger.warning("✗ Error processing clarifications: %s", e)
         return {
             "clarifications_needed": [f"Failed to process clarifications: {str(e)}"],
             "current_step": "ask_clarifications"
@@ -117,50 +409,52 @@ def route_after_clarification_check(state: CampaignState) -> str:
     Routing function to decide next step after checking clarifications.
     Returns the name of the next node.
     """
-    if state.get("clarifications_needed") and len(state["clarifications_needed"]) > 0:
-        return "ask_clarifications"
-    else:
-        # All clarifications resolved, move to checking smart lists
-        return "check_smart_lists"
+    # All clarifications resolved -> move to checking smart lists.
+    # (State dicts aren't hashable, so there's nothing to memoize here.)
+    return "ask_clarifications" if state.get("clarifications_needed") else "check_smart_lists"
 
 
-async def fetch_and_match_smart_lists(state: CampaignState, llm, credentials: dict = None) -> dict:
+async def fetch_and_match_smart_lists(state: CampaignState, llm, credentials: dict = None, lists_result: dict = None) -> dict:
     """
     Fetch existing smart lists and find matches with the audience description.
     Returns top 3 matches using LLM to assess relevance.
+    
+    A successful get_existing_smart_lists result fetched ahead of time
+    (e.g. concurrently with prompt parsing) can be passed as lists_result
+    to skip the fetch.
     """
-    print(f"\n[Checking existing smart lists...]")
+    logger.info("[Checking existing smart lists...]")
     
     location_id = state.get("location_id") or os.getenv("FREDERICK_LOCATION_ID")
     
     if not location_id:
-        print("✗ No location ID provided, skipping smart list check")
-        return {
-            "create_new_list": True,
-            "current_step": "confirm_new_list"
-        }
-    
-    # Import MCP tool
-    try:
-        from src.mcp.contacts_mcp import get_existing_smart_lists
-    except ImportError:
-        print("✗ MCP tools not available, skipping smart list check")
+        logger.info("✗ No location ID provided, skipping smart list check")
         return {
             "create_new_list": True,
             "current_step": "confirm_new_list"
         }
     
-    # Fetch existing smart lists with credentials
-    credentials = credentials or {}
-    result = await get_existing_smart_lists(
-        location_id,
-        api_key=credentials.get("api_key"),
-        bearer_token=credentials.get("bearer_token"),
-        api_url=credentials.get("api_url")
-    )
+    if lists_result is not None:
+        result = lists_result
+    else:
+        if get_existing_smart_lists is None:
+            logger.info("✗ MCP tools not available, skipping smart list check")
+            return {
+                "create_new_list": True,
+                "current_step": "confirm_new_list"
+            }
+        
+        # Fetch existing smart lists with credentials
+        credentials = credentials or {}
+        result = await get_existing_smart_lists(
+            location_id,
+            api_key=credentials.get("api_key"),
+            bearer_token=credentials.get("bearer_token"),
+            api_url=credentials.get("api_url")
+        )
     
     if "error" in result:
-        print(f"✗ Error fetching smart lists: {result.get('message', 'Unknown error')}")
+        logger.warning("✗ Error fetching smart lists: %s", result.get("message", "Unknown error"))
         return {
             "create_new_list": True,
             "current_step": "confirm_new_list"
@@ -169,17 +463,19 @@ async def fetch_and_match_smart_lists(state: CampaignState, llm, credentials: di
     lists_data = result.get("data", [])
     
     if not lists_data:
-        print("✓ No existing smart lists found")
+        logger.info("✓ No existing smart lists found")
         return {
             "create_new_list": True,
             "current_step": "confirm_new_list"
         }
     
-    print(f"✓ Found {len(lists_data)} existing smart lists")
+    logger.info("✓ Found %d existing smart lists", len(lists_data))
     
-    # Prepare list info for LLM matching
+    # Prepare list info for LLM matching (the prefilter ranks every list;
+    # without it only the first 50 are sent to the LLM)
+    candidates = lists_data if SMART_LIST_PREFILTER_TOP_K > 0 else lists_data[:50]
     list_descriptions = []
-    for item in lists_data:
+    for item in candidates:
         attrs = item.get("attributes", {})
         list_descriptions.append({
             "id": item.get("id"),
@@ -191,52 +487,42 @@ async def fetch_and_match_smart_lists(state: CampaignState, llm, credentials: di
     # Use LLM to find best matches
     audience_desc = state.get("audience", "")
     
-    matching_prompt = ChatPromptTemplate.from_messages([
-        ("system", """You are helping match a campaign audience description with existing contact lists.
-
-Audience Description: {audience}
-
-Available Contact Lists:
-{lists}
-
-Find up to 3 best matching lists based on how well they align with the audience description.
-Consider list name, display name and filters to find a match.
-
-Return the result in JSON format:
-{{
-    "matches": [
-        {{
-            "id": "list_id",
-            "relevance_score": 0.95,
-            "reason": "why this list matches"
-        }}
-    ],
-    "has_matches": true or false
-}}
-
-Only include lists with relevance_score > 0.5. Return empty matches array if no good matches found."""),
-        ("human", "Find the best matching lists for this audience.")
-    ])
+    # Keyed by id for lookup of the matches
+    list_by_id = {
+        l["id"]: l
+        for l in await _prefilter_lists(location_id, audience_desc, list_descriptions)
+    }
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        for l in list_by_id.values():
+            logger.debug("  Candidate list %s: %s", l["id"], l["name"])
     
     # Format lists for prompt
     lists_text = "\n".join([
-        f"- ID: {l['id']}, Name: {l['name']}, Display Name: {l.get('display_name', 'N/A')}, Filters: {l.get('filters', [])}"
-        for l in list_descriptions[:50]  # Limit to first 50 lists
+        f"- ID: {l['id']}, Name: {l['name']}, Display Name: {l.get('display_name', 'N/A')}, Filters: {_summarize_filters(l.get('filters'))}"
+        for l in list_by_id.values()
     ])
     
     try:
-        parser = JsonOutputParser()
-        chain = matching_prompt | llm | parser
+        chain = _match_chain(llm)
         
-        match_result = chain.invoke({
+        inputs = {
             "audience": audience_desc,
             "lists": lists_text
-        })
+        }
+        
+        async def match():
+            # Cached as a plain dict so it can be shared through Redis
+            return (await chain.ainvoke(inputs)).model_dump()
+        
+        match_result = MatchResult.model_validate(
+            await cached_llm_call(llm, SMART_LIST_MATCHING_PROMPT, inputs, match)
+        )
         
-        matches = match_result.get("matches", [])
+        matches = match_result.matches
         
-        if not matches or not match_result.get("has_matches", False):
-            print("✓ No relevant matches found")
+        if not matches or not match_result.has_matches:
+            logger.info("✓ No relevant matches found")
             return {
                 "create_new_list": True,
                 "current_step": "confirm_new_list"
@@ -245,16 +531,16 @@ Only include lists with relevance_score > 0.5. Return empty matches array if no
         # Get full details for matched lists
         matched_lists = []
         for match in matches[:3]:  # Top 3 matches
-            list_id = match.get("id")
-            full_list = next((l for l in list_descriptions if l["id"] == list_id), None)
+            list_id = match.id
+            full_list = list_by_id.get(list_id)
             if full_list:
                 matched_lists.append({
                     **full_list,
-                    "relevance_score": match.get("relevance_score"),
-                    "reason": match.get("reason")
+                    "relevance_score": match.relevance_score,
+                    "reason": match.reason
                 })
         
-        print(f"✓ Found {len(matched_lists)} relevant match(es)")
+        logger.info("✓ Found %d relevant match(es)", len(matched_lists))
      
         return {
             "matched_lists": matched_lists,
@@ -262,7 +548,7 @@ Only include lists with relevance_score > 0.5. Return empty matches array if no
         }
         
     except Exception as e:
-        print(f"✗ Error matching lists: {e}")
+        logger.warning("✗ Error matching lists: %s", e)
         return {
             "create_new_list": True,
             "current_step": "confirm_new_list"
@@ -1,25 +1,44 @@
 """
 Prompt templates for campaign generation workflow
+
+Templates are parsed once at import and marked Final; nodes import them
+instead of building ChatPromptTemplates per request.
 """
 
-from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+from functools import lru_cache
+from typing import Final
+from langchain_core.messages import SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 
-# Prompt for parsing user input into campaign components
-PARSE_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
-    ("system", """You are an expert at parsing marketing emails campaign requests.
+# Prompt templates keep the system message fully static and put every
+# per-request value in the human message, so providers that cache prompt
+# prefixes (e.g. OpenAI) can reuse the system part across requests.
+# The parse/update/matching prompts are used with structured output, so the
+# response format comes from the pydantic models in models.py, not prompt text.
+# Their system text has no variables, so it is passed as a ready-made
+# SystemMessage and only the human message is formatted per call.
 
-Today's date is: {current_date}
+# Rules shared by the parse and update prompts
+COMMON_CAMPAIGN_RULES = """- Make reasonable assumptions for less critical details
+- We are working with a single location/studio. Do not ask about multiple locations.
+- Location/sender details like name, timezone, address are provided via the location context. Do not ask such questions.
+- Assume the system separately handles the recipient's opt-in status. We don't need to ask about it.
+- Do not ask about desired subject line and preheader text, offer/discount details, sender details or the existence of smart list filters. We'll handle that later.
+- If the user wants to send to "everyone", "all customers", "all clients", "all audience", "all subscribers", "entire customer base", or similar → set audience to "all_customers"
+- DATETIME: convert relative dates (like "Black Friday", "next Monday", "in 2 weeks") to specific dates based on today's date, in ISO 8601 format with the location's timezone offset (e.g., "2025-11-28T14:15:00+05:30"). The campaign is always sent in the location's timezone.
+- Questions in missing_info must be mutually exclusive. Do not ask about the same thing in multiple questions.
+"""
 
-LOCATION CONTEXT:
-{location_context}
+# Prompt for parsing user input into campaign components
+PARSE_SYSTEM_PROMPT = """You are an expert at parsing marketing emails campaign requests.
+
+Today's date and the location context are given with the campaign prompt.
 
 Extract the following information from the user's campaign prompt:
-1. AUDIENCE: Who should receive this campaign (location, demographics, behavior, past interactions, etc.)
-   - If the user wants to send to "everyone", "all customers", "all clients", "all audience", "all subscribers", "entire customer base", or similar → set audience to "all_customers"
-   - Otherwise, provide specific audience criteria
-2. TEMPLATE: A short description of the campaign email content. 
-3. DATETIME: When should the campaign be sent (date and time in ISO 8601 format with timezone offset, e.g., "2025-11-28T14:15:00+05:30"). Convert relative dates (like "Black Friday", "next Monday", "in 2 weeks") to specific dates based on today's date. Use the location's timezone from the context above.
+1. AUDIENCE: Who should receive this campaign (location, demographics, behavior, past interactions, etc.), or "all_customers"
+2. TEMPLATE: A short description of the campaign email content.
+3. DATETIME: When should the campaign be sent
 4. IMAGE_SEARCH_QUERIES: Generate 1-2 focused, specific search queries (2-3 words each) for finding relevant stock images that match the campaign theme
    - Examples: For a yoga studio promotion → ["yoga class", "meditation studio"]
    - Examples: For a fitness sale → ["gym workout", "fitness training"]
@@ -27,91 +46,91 @@ Extract the following information from the user's campaign prompt:
    - Keep queries SHORT and SPECIFIC - avoid full sentences
 5. MISSING_INFO: What critical information is missing or ambiguous. Do not ask low level details of the email template. We'll handle that later.
 
-IMPORTANT: 
+IMPORTANT:
 - Only identify the MOST CRITICAL missing information (maximum 3 questions)
-- Make reasonable assumptions for less critical details
-- We are working with a single location/studio. Do not ask about multiple locations.
 - Prioritize: audience criteria > datetime specifics > one line description of the campaign email content
-- Do not ask offer/discount details. Also do not ask about sender details. We'll handle that later.
-- location/sender details like name, timezone, address are provided via Location context. Do not ask such questions.
 - If any component is not clearly specified, note it in missing_info
-- Use the current date provided to calculate specific dates for holidays and relative dates
-- Assume the system separately handles the recipent's opt-in status. We don't need to ask about it.
-- Assume the campaign send timezone is always the location's timezone.
-- Do not ask about desired subject line and preheader text. We'll handle that later.
-- Do not ask about the existence of smart list filters. We'll handle that later.
-- All the questions in missing_info should be mutually exclusive. Do not ask about the same thing in multiple questions.
-- Generate a short smart list name (2-8 words max) that describes the audience. The name should start with "AI - "
-
-Return the result in JSON format matching this structure:
-{{
-    "audience": "description of target audience",
-    "template": "description of campaign content and offer",
-    "datetime": "YYYY-MM-DDTHH:MM:SS+TZ:TZ (ISO 8601 format with location's timezone offset)",
-    "smart_list_name": "AI - [short 2-8 word description of the audience]",
-    "image_search_queries": ["query1", "query2"],
-    "missing_info": ["list of up to 3 most critical missing items"]
-}}"""),
-    ("human", "{prompt}")
+""" + COMMON_CAMPAIGN_RULES
+
+PARSE_PROMPT_TEMPLATE: Final = ChatPromptTemplate.from_messages([
+    SystemMessage(content=PARSE_SYSTEM_PROMPT),
+    ("human", """Today's date is: {current_date}
+
+LOCATION CONTEXT:
+{location_context}
+
+CAMPAIGN PROMPT:
+{prompt}""")
 ])
 
 
 # Prompt for processing clarifications and updating campaign details
-UPDATE_PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
-    ("system", """You are updating a marketing campaign based on user clarifications.
+UPDATE_SYSTEM_PROMPT = """You are updating a marketing campaign based on user clarifications.
+
+Today's date, the location context, the original campaign details and the user's clarifications are given in the user message.
+
+Based on these clarifications, update the campaign details and identify if any information is still missing.
+
+IMPORTANT:
+- Only ask for CRITICAL missing information (maximum 5 total questions across all rounds)
+- If sufficient information is available, proceed even if some details could be more specific
+""" + COMMON_CAMPAIGN_RULES
 
-Today's date is: {current_date}
+UPDATE_PROMPT_TEMPLATE: Final = ChatPromptTemplate.from_messages([
+    SystemMessage(content=UPDATE_SYSTEM_PROMPT),
+    ("human", """Today's date is: {current_date}
 
 LOCATION CONTEXT:
 {location_context}
-    
+
 Original campaign details:
 - Audience: {audience}
 - Template: {template}
 - DateTime: {datetime}
 
-User has provided the following clarifications:
+User has provided the following clarifications (one {{"q": question, "a": answer}} JSON object per line):
 {clarifications}
 
-Based on these clarifications, update the campaign details and identify if any information is still missing.
+Update the campaign based on the clarifications provided.""")
+])
 
-IMPORTANT:
-- Only ask for CRITICAL missing information (maximum 5 total questions across all rounds)
-- Make reasonable assumptions for minor details
-- We are working with a single location/studio. Do not ask about multiple locations.
-- If sufficient information is available, proceed even if some details could be more specific
-- Assume the system separately handles the recipent's opt-in status. We don't need to ask about it.
-- Assume the campaign send timezone is always the location's timezone.
-- Do not ask about desired subject line and preheader text. We'll handle that later.
-- Do not ask about the existence of smart list filters. We'll handle that later.
-- Convert relative dates (like "Black Friday", "next Monday", "in 2 weeks") to specific dates based on today's date
-- Generate a short smart list name (2-8 words max) that describes the audience. The name should start with "AI - "
-- DateTime must be in ISO 8601 format with timezone offset (e.g., "2025-11-28T14:15:00+05:30"). Use the location's timezone from the context above.
-- If the user wants to send to "everyone", "all customers", "all clients", "all audience", "all subscribers", "entire customer base", or similar → set audience to "all_customers"
 
-Return the result in JSON format:
-{{
-    "audience": "updated audience description",
-    "template": "updated template/content description",
-    "datetime": "YYYY-MM-DDTHH:MM:SS+TZ:TZ (ISO 8601 format with location's timezone offset)",
-    "smart_list_name": "AI - [short 2-8 word description of the audience]",
-    "image_search_queries": ["query1", "query2"],
-    "missing_info": ["up to 3 most critical remaining items, empty list if sufficient info"]
-}}"""),
-    ("human", "Update the campaign based on the clarifications provided.")
+# Prompt for matching the campaign audience against existing smart lists
+SMART_LIST_MATCHING_SYSTEM_PROMPT = """You are helping match a campaign audience description with existing contact lists.
+
+The audience description and the available contact lists are given in the user message.
+
+Find up to 3 best matching lists based on how well they align with the audience description.
+Consider list name, display name and filters to find a match.
+
+Only include lists with relevance_score > 0.5. Return empty matches array if no good matches found."""
+
+SMART_LIST_MATCHING_PROMPT: Final = ChatPromptTemplate.from_messages([
+    SystemMessage(content=SMART_LIST_MATCHING_SYSTEM_PROMPT),
+    ("human", """Audience Description: {audience}
+
+Available Contact Lists:
+{lists}
+
+Find the best matching lists for this audience.""")
 ])
 
 
-# FredQL Smart List Generation System Prompt  
+# FredQL Smart List Generation System Prompt
+# The filter documentation is a constant system message (JSON below is
+# literal); everything that varies per location or request goes in the human
+# message (FREDQL_USER_TAIL), so provider prompt caching can reuse the whole
+# system turn.
 FREDQL_SYSTEM_PROMPT = """You are an expert at generating FredQL queries for creating smart contact lists.
 
-{location_context}
+The location context, available contact properties, available interaction types
+and the audience description are given in the user message.
 
 ## FredQL Structure
 FredQL uses nested arrays where:
 - Inner arrays contain filters that are ANDed together
 - Outer array elements are ORed together
-- Format: [[{{AND THIS}}, {{AND THIS}}], [{{OR THIS}}]]
+- Format: [[{AND THIS}, {AND THIS}], [{OR THIS}]]
 
 ## Filter Types
 
@@ -140,9 +159,9 @@ Operators:
 - anniversary_within_days: anniversary is within x days (date, timestamp)
 
 Examples:
-- First name is "Homer": [[{{"filter_type": "contact_property", "property_name": "first_name", "operator": "equals", "value": "Homer"}}]]
-- Email contains "gmail": [[{{"filter_type": "contact_property", "property_name": "email", "operator": "contains", "value": "gmail"}}]]
-- Birthday within 30 days: [[{{"filter_type": "contact_property", "property_name": "birth_date", "operator": "anniversary_within_days", "value": "30"}}]]
+- First name is "Homer": [[{"filter_type": "contact_property", "property_name": "first_name", "operator": "equals", "value": "Homer"}]]
+- Email contains "gmail": [[{"filter_type": "contact_property", "property_name": "email", "operator": "contains", "value": "gmail"}]]
+- Birthday within 30 days: [[{"filter_type": "contact_property", "property_name": "birth_date", "operator": "anniversary_within_days", "value": "30"}]]
 
 ### 2. INTERACTION Filter
 Segments contacts by their interactions (appointments, emails, purchases, etc.)
@@ -153,33 +172,25 @@ Required fields:
 - interaction_type: string or array (e.g., "completed_appointment", ["opened_email", "clicked_email"])
 
 Optional timing fields:
-- last_occurred_within_minutes_ago: within last X minutes
+- last_occurred_within: within the last duration, as a number plus unit: m (minutes), h, d, w, mo, y (e.g. "7d", "6mo")
 - occurred_before: before specific datetime
 - occurred_at_or_after: at or after specific datetime
-- first_occurred_within_minutes_ago: first occurrence within X minutes
+- first_occurred_within: first occurrence within the duration (same format)
 - min_occurrences: minimum number of occurrences
 - max_occurrences: maximum number of occurrences
 
 Optional metadata filters (ANDed together):
-- metadata: [{{"key": "field_name", "operator": "equals", "value": "some_value"}}]
+- metadata: [{"key": "field_name", "operator": "equals", "value": "some_value"}]
 
 Metadata operators: equals, not_equals, is_blank, is_not_blank, less_than, greater_than, any_of
 
-IMPORTANT: ONLY use interaction types from this EXACT list (no variations or custom types):
-{{interaction_types}}
+IMPORTANT: ONLY use interaction types from the "Interaction Types available" list in the user message (exact matches, no variations or custom types).
 
 If you cannot confidently map the user's request to these exact interaction types, you MUST indicate low confidence.
 
-Time conversions:
-- 1 hour = 60 minutes
-- 1 day = 1440 minutes
-- 1 week = 10080 minutes
-- 30 days = 43200 minutes
-- 180 days = 259200 minutes
-
 Examples:
-- Completed appointment in last 7 days: [[{{"filter_type": "interaction", "operator": "has_interaction", "interaction_type": "completed_appointment", "last_occurred_within_minutes_ago": 10080}}]]
-- No appointment in 6 months: [[{{"filter_type": "interaction", "operator": "has_no_interaction", "interaction_type": ["booked_appointment", "completed_appointment"], "last_occurred_within_minutes_ago": 259200}}]]
+- Completed appointment in last 7 days: [[{"filter_type": "interaction", "operator": "has_interaction", "interaction_type": "completed_appointment", "last_occurred_within": "7d"}]]
+- No appointment in 6 months: [[{"filter_type": "interaction", "operator": "has_no_interaction", "interaction_type": ["booked_appointment", "completed_appointment"], "last_occurred_within": "6mo"}]]
 
 ### 3. CONTACT_LIST Filter
 Uses existing contact lists in queries
@@ -190,30 +201,30 @@ Required fields:
 - list_name: exact name of the list
 
 Examples:
-- In VIP list: [[{{"filter_type": "contact_list", "operator": "in_list", "list_name": "vip_customers"}}]]
+- In VIP list: [[{"filter_type": "contact_list", "operator": "in_list", "list_name": "vip_customers"}]]
 
 ## Complex Query Examples
 
 Multiple conditions (AND):
 [[
-  {{"filter_type": "contact_property", "property_name": "email", "operator": "is_not_blank"}},
-  {{"filter_type": "interaction", "operator": "has_interaction", "interaction_type": "completed_appointment", "last_occurred_within_minutes_ago": 43200}}
+  {"filter_type": "contact_property", "property_name": "email", "operator": "is_not_blank"},
+  {"filter_type": "interaction", "operator": "has_interaction", "interaction_type": "completed_appointment", "last_occurred_within": "30d"}
 ]]
 
 Multiple conditions (OR):
 [
-  [{{"filter_type": "contact_property", "property_name": "city", "operator": "equals", "value": "New York"}}],
-  [{{"filter_type": "contact_property", "property_name": "city", "operator": "equals", "value": "Los Angeles"}}]
+  [{"filter_type": "contact_property", "property_name": "city", "operator": "equals", "value": "New York"}],
+  [{"filter_type": "contact_property", "property_name": "city", "operator": "equals", "value": "Los Angeles"}]
 ]
 
 Combined (AND + OR):
 [
   [
-    {{"filter_type": "contact_property", "property_name": "marketing_email_subscribed", "operator": "equals", "value": true}},
-    {{"filter_type": "interaction", "operator": "has_interaction", "interaction_type": "completed_appointment", "last_occurred_within_minutes_ago": 43200}}
+    {"filter_type": "contact_property", "property_name": "marketing_email_subscribed", "operator": "equals", "value": true},
+    {"filter_type": "interaction", "operator": "has_interaction", "interaction_type": "completed_appointment", "last_occurred_within": "30d"}
   ],
   [
-    {{"filter_type": "contact_list", "operator": "in_list", "list_name": "vips"}}
+    {"filter_type": "contact_list", "operator": "in_list", "list_name": "vips"}
   ]
 ]
 
@@ -221,14 +232,14 @@ Combined (AND + OR):
 When given an audience description, generate a valid FredQL query AND a meaningful name that:
 1. Matches the semantic intent of the description
 2. Uses appropriate filter types and operators
-3. Converts time periods to minutes correctly
+3. Expresses time periods as durations (e.g. "7d", "6mo")
 4. Handles multiple conditions with proper AND/OR logic
-5. Uses ONLY interaction types from the valid list above (exact matches required)
+5. Uses ONLY interaction types from the valid list in the user message (exact matches required)
 6. Uses ONLY contact properties from the list provided for this location
 7. Generates a clear, descriptive name starting with "AI - " (2-8 words)
 
 IMPORTANT Guidelines:
-- If interaction type is mentioned, use the closest match from the valid list above
+- If interaction type is mentioned, use the closest match from the valid list in the user message
 - If a contact property is mentioned, use the closest match from the available properties
 - If audience can be represented with basic filters (email, interactions, etc.), generate the query
 - Be creative and flexible in interpreting user intent with available filters
@@ -241,19 +252,14 @@ ONLY return error if:
   you can use "booked_appointment" as a reasonable proxy
 
 Success format:
-{{"fredql_query": [[...]], "smart_list_name": "AI - [descriptive name]"}}
+{"fredql_query": [[...]], "smart_list_name": "AI - [descriptive name]"}
 
 Error format (use ONLY when truly impossible):
-{{"error": "manual_creation_required", "reason": "Specific reason why this cannot be represented"}}
+{"error": "manual_creation_required", "reason": "Specific reason why this cannot be represented"}
 """
 
 
-FREDQL_GENERATION_TEMPLATE = PromptTemplate.from_template(
-    FREDQL_SYSTEM_PROMPT + """
-
-Audience Description: {audience_description}
-
-Location Context: {location_context}
+FREDQL_USER_TAIL = """Location Context: {location_context}
 
 Contact Properties available for this location:
 {contact_properties}
@@ -261,169 +267,145 @@ Contact Properties available for this location:
 Interaction Types available:
 {interaction_types}
 
+Audience Description: {audience_description}
+
 Generate FredQL query:"""
-)
 
+FREDQL_GENERATION_TEMPLATE: Final = ChatPromptTemplate.from_messages([
+    SystemMessage(content=FREDQL_SYSTEM_PROMPT),
+    ("human", FREDQL_USER_TAIL)
+])
+
+
+@lru_cache(maxsize=256)
+def fredql_template_for_location(location_id: str, interaction_types: str, contact_properties: str) -> ChatPromptTemplate:
+    """
+    Return FREDQL_GENERATION_TEMPLATE with a location's interaction types and
+    contact properties bound, so only the audience and location context are
+    filled in per request.
+    
+    Args:
+        location_id: Frederick location ID
+        interaction_types: Formatted interaction types for the location
+        contact_properties: Formatted contact properties for the location
+        
+    Returns:
+        ChatPromptTemplate taking audience_description and location_context
+    """
+    return FREDQL_GENERATION_TEMPLATE.partial(
+        interaction_types=interaction_types,
+        contact_properties=contact_properties
+    )
+
+
+# Prompt for generating the campaign email. The instructions are a constant
+# SystemMessage (merge tags below are literal). Each reference template is its
+# own message (the same for every campaign of a business until it sends a new
+# email), followed by the per-request business details and brief.
+# The HTML is streamed as raw text (a JSON envelope would escape every quote
+# and newline); the campaign name and subject line come from EMAIL_META_PROMPT.
+EMAIL_TEMPLATE_GENERATION_SYSTEM_PROMPT = """You are an expert email marketing template designer. Recent reference templates from the business are given as separate messages (the most recent as full HTML, older ones as a JSON style fingerprint of their brand colors, fonts, logo and image URLs, button styles, block layout and a text sample), followed by the business, its location context, social profile links, merge tags, stock images and the campaign brief.
+
+Generate the HTML email template for this campaign: a complete, valid HTML email with meaningful, engaging content of around 300-500 words, tailored to the campaign brief.
+
+REQUIREMENTS (each applies to the whole email):
+1. **Reference templates are inspiration, not a copy**: reuse their color palette, fonts, button styling (colors, padding, border-radius), spacing, layout patterns, header/footer design, logo image URLs and brand voice, while bringing fresh creative ideas so the email feels like the same brand family.
+2. **Structure, in this order**:
+   1. Hero image: a full-width PEXELS image as the very first visual element
+   2. Header/logo (if applicable, overlaid on the hero or below it)
+   3. Personalized greeting, e.g. {{contact.properties.first_name default="there"}}
+   4. Main content: multiple blocks with varied layouts (text, image+text side-by-side, inline images, image grids)
+   5. Call-to-action button (if appropriate)
+   6. Social links block: every link from SOCIAL PROFILE LINKS with its image_url icon (omit the block if none are provided)
+   7. Closing/signature (e.g., "Warm wishes, [Business Name] Team") as the last meaningful content; no images, buttons or content blocks after it
+   8. Footer: company name and address (from the location context) and the unsubscribe link: No longer want these emails? <a href="{{unsubscribe_link}}" target="_blank">Unsubscribe</a>
+3. **Images**: use 1-3 of the provided PEXELS image URLs (never placeholder images). Put descriptions only in the `alt` attribute and never show alt text, photographer names or photo credits as visible text.
+4. **Merge tags**: use the EXACT values from MERGE TAGS, wrapped in double curly braces (e.g., {{location.name}}, {{location.address}}, {{location.online_booking_url}}, {{location.website}}). Do not invent other template variables such as {{customer.first_name}} or {{offering.name}}.
+5. **Social links**: use only the links from SOCIAL PROFILE LINKS, never ones from the reference templates.
+6. **HTML**: table-based, mobile-responsive, email-safe markup with inline CSS only; no markdown, no script/iframe or other unsafe tags.
+
+Layout snippets:
+- Hero: `<img src="[pexels-url]" alt="..." style="width:100%; max-width:600px; height:auto; display:block;">`
+- Image + text (swap the cells for text + image):
+  `<table style="width:100%;"><tr><td style="width:50%; padding:10px;"><img src="[pexels-url]" alt="..." style="width:100%;"></td><td style="width:50%; padding:10px; vertical-align:middle;">[text]</td></tr></table>`
+
+Output only the complete HTML, starting with <!DOCTYPE html>: no prose, no JSON, no markdown fences.
+"""
 
-# Email Template Generation Prompt
-EMAIL_TEMPLATE_GENERATION_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", """You are an expert email marketing template designer for {business_name}.
+EMAIL_TEMPLATE_GENERATION_PROMPT: Final = ChatPromptTemplate.from_messages([
+    SystemMessage(content=EMAIL_TEMPLATE_GENERATION_SYSTEM_PROMPT),
+    MessagesPlaceholder("reference_templates"),
+    ("human", """BUSINESS: {business_name}
 
 LOCATION CONTEXT:
 {location_context}
 
-SOCIAL PROFILE LINKS (use ONLY these valid links):
+SOCIAL PROFILE LINKS:
 {social_links}
 
+MERGE TAGS:
+{merge_tags}
+
+PEXELS IMAGES:
+{pexels_images}
+
 CAMPAIGN BRIEF:
 {campaign_description}
 
-PEXELS IMAGES (use 1-3 of these FREE high-quality images in your email):
-{pexels_images}
+Generate the email template now.""")
+])
 
-MERGE TAGS (personalization/dynamic tags):
-{merge_tags}
+# Prompt for the campaign name and subject line. Small and independent of the
+# HTML, so it runs on its own (typically smaller) model alongside the HTML stream.
+EMAIL_META_SYSTEM_PROMPT = """You are an expert email marketer naming a new email campaign for a business.
 
-MERGE TAG USAGE:
-- **Always start emails with a personalized greeting** using {{{{contact.properties.first_name default="there"}}}} when available
-- Use other merge tags where appropriate throughout the email
-- **Use EXACT merge tag values** from the list above
-- **Format**: Wrap in double curly braces like {{{{merge_tag_value}}}}
-- Common examples:
-  * {{{{contact.properties.first_name default="there"}}}} for customer's first name
-  * {{{{location.name}}}} for business name
-  * {{{{location.address}}}} for business address
-  * {{{{location.online_booking_url}}}} for booking links
-  * {{{{location.website}}}} for website link
-  * {{{{system.unsubscribe_link}}}} for unsubscribe (required in footer)
-
-REFERENCE TEMPLATES:
-Below are some recent email templates from this business. **Use these as INSPIRATION and GUIDANCE** for:
-- **COLOR SCHEMES**: Prefer similar colors and tones (backgrounds, text, buttons, borders)
-- **FONT STYLING**: Consider similar font families, sizes, and weights
-- **LAYOUT PATTERNS**: Take inspiration from table structures, padding, margins
-- **BRAND VOICE**: Match the writing style, tone, and language patterns
-- **BUTTON STYLES**: Use similar styling for call-to-action buttons (colors, padding, border-radius)
-- **HEADER/FOOTER DESIGN**: Follow similar patterns for logo placement, social icons, footer structure
-- **SPACING**: Maintain professional spacing between elements
-
-**Balance creativity with consistency**: Create a fresh, engaging design that feels like it belongs to the same brand family while bringing new creative ideas to the campaign.
+Generate:
+1. **Campaign Name**: a descriptive internal name starting with "AI - " (e.g., "AI - Spring Sale - March 2024", "AI - New Member Welcome")
+2. **Subject Line**: concise (under 60 characters), engaging, related to the campaign brief and in the tone of the business's recent subject lines
 
-{reference_templates}
+Both are plain text: no merge tags or template variables such as {{location.name}}.
+"""
+
+EMAIL_META_PROMPT: Final = ChatPromptTemplate.from_messages([
+    SystemMessage(content=EMAIL_META_SYSTEM_PROMPT),
+    ("human", """BUSINESS: {business_name}
+
+RECENT SUBJECT LINES:
+{recent_subject_lines}
 
-TASK:
-Generate three components for this email campaign:
-
-1. **Campaign Name**: A descriptive internal name for this campaign starting with "AI - " (e.g., "AI - Spring Sale - March 2024", "AI - New Member Welcome")
-   - **DO NOT use merge tags in campaign name** - Use plain text only
-
-2. **Subject Line**: An engaging email subject line that:
-   - Matches the brand's tone from reference templates
-   - Is concise (under 60 characters)
-   - Encourages opens
-   - Relates to the campaign brief
-   - **DO NOT use merge tags in subject line** - Use plain text only
-
-3. **HTML Email Template**: A complete, valid HTML email that:
-   - **Draw inspiration from reference templates** while being creative:
-     * Use similar color palettes (backgrounds, text, buttons) as inspiration
-     * Consider similar font families and sizes as a starting point
-     * Take inspiration from button styling (colors, padding, border-radius)
-     * Use consistent, professional spacing between elements
-     * Follow similar layout patterns but feel free to innovate
-     * Reuse logo image URLs if present in reference templates
-   - **Preserves the brand identity**: Match the writing style, tone, and language from reference templates
-   - **Follows the structure**: Use similar layout patterns (header, content blocks, CTA, footer) from reference templates
-   - **Includes meaningful, engaging content in the email body** - not just structure, but actual relevant content
-   - **Start with a greeting** to the customer
-   - **MUST include 1-3 images from PEXELS IMAGES section** - Use the actual image URLs provided above
-   - **Use alt text properly**: Put alt descriptions in the `alt` attribute only (e.g., `<img src="..." alt="description">`) - do NOT display alt text as visible text
-   - **Creative Image Layouts**: Use varied, engaging image placements:
-     * **Hero image**: Full-width image at the top
-     * **Image + Text blocks**: Two-column layouts with image on left (or right) and text on right (or left)
-     * **Inline images**: Images integrated within content blocks
-     * **Image grid**: Multiple smaller images together
-     * **DO NOT put images after the signature/closing** - All images and CTAs must come BEFORE the closing/signature
-   - **Email Structure** (MUST follow this order):
-     1. **Hero Image** - MUST start with a full-width hero image from PEXELS IMAGES at the very top
-     2. Header/Logo (if applicable, can be overlaid on hero or below it)
-     3. Greeting using merge tags (e.g., "{{{{salutation}}}} {{{{first_name}}}},")
-     4. Main content with additional images and text blocks (use creative layouts)
-     5. Call-to-action button (if needed)
-     6. Closing/Signature (e.g., "Warm wishes, [Business Name] Team") - **This should be the last meaningful content**
-     7. Footer (company address, social links, unsubscribe)
-   - **Includes all standard elements**:
-     - Unsubscribe link: Must include at the bottom - No longer want these emails? <a href="{{{{unsubscribe_link}}}}" target="_blank">Unsubscribe</a>
-     - Company name and address (from location context)
-     - Social media links must be used from SOCIAL PROFILE LINKS section and not from the existing email templates
-     - Must include all the social media links from the SOCIAL PROFILE LINKS section just before signature
-     - If no social media links are provided, do not include the social links block
-     - Use the social links icons from the SOCIAL PROFILE LINKS section which are provided as image_url and add respective url.
-     - Multiple content blocks in MAIN CONTENT area: Use varied layouts like text blocks, image+text blocks (side-by-side), video+text blocks
-     - Create medium size email template which has around 300-500 words of content
-   - **Adapts the content**: Tailor the message to match the campaign brief
-   - **Must NOT use any template variables** like {{{{customer.first_name}}}}, {{{{offering.name}}}}, etc.
-   - **Maintains visual consistency**: Keep logos, brand colors, fonts that appear in reference templates
-   - **Is mobile-responsive**: Use standard email-safe HTML and inline CSS
-
-IMPORTANT GUIDELINES:
-- Generate ONLY valid HTML email code (no markdown, no explanations)
-- Use only inline CSS for all styling to ensure compatibility across email clients
-- **Draw from reference templates**: Use similar visual styling (colors, fonts, button styles, spacing) as inspiration while being creative
-- **MUST start with a hero image** - The email MUST begin with a full-width hero image from PEXELS IMAGES
-- **MUST use 1-3 images from PEXELS IMAGES section** - Use the actual URLs provided, not placeholders
-- **Use alt text ONLY in the alt attribute** - Do NOT display alt text as visible text in the email
-- **DO NOT display photographer names or credits** - Do NOT add any text like "Photo by [photographer]" anywhere in the email
-- **Maintain brand consistency**: Create a design that feels cohesive with the brand while bringing fresh creative ideas
-- **DO NOT use merge tags in campaign name or subject line** - Merge tags are ONLY for email body content
-
-**CREATIVE IMAGE LAYOUT EXAMPLES**:
-  1. **Hero Image (REQUIRED at top)**: 
-     `<img src="[pexels-url]" alt="..." style="width:100%; max-width:600px; height:auto; display:block;">`
-     This MUST be the first visual element in your email.
-  2. **Image + Text (Left/Right)**:
-     ```
-     <table style="width:100%;">
-       <tr>
-         <td style="width:50%; padding:10px;"><img src="[pexels-url]" alt="..." style="width:100%;"></td>
-         <td style="width:50%; padding:10px; vertical-align:middle;">[Your text content here]</td>
-       </tr>
-     </table>
-     ```
-  3. **Text + Image (Right/Left)**: Reverse the columns above
-  4. Mix and match these layouts for visual variety
-
-**CRITICAL STRUCTURE RULES**:
-- ALL images, CTAs, and content blocks MUST come BEFORE the closing/signature
-- Closing/signature (e.g., "Warm wishes, Team") should be the LAST meaningful content
-- NEVER place images, buttons, or content blocks after the signature
-- Order: Content → CTA → Signature → Footer (address, social links, unsubscribe)
-
-- Include meaningful, engaging content that matches the campaign request
-- Make the email responsive and professional using table-based layouts
-- Include a clear call-to-action (if appropriate)
-- Use professional email styling with proper spacing, colors, and typography
-- DO NOT add markdown formatting in HTML
-- ALWAYS include the unsubscribe link: <a href="{{{{unsubscribe_link}}}}">Unsubscribe</a>
-- Use only the social links provided in SOCIAL PROFILE LINKS section
-- **Keep the email sanitised**: Do not include unsafe tags like Script, iframe etc.
-- Must NOT add any template variable in the generated HTML
-- DO NOT create placeholder images - ONLY use the provided Pexels image URLs
-
-Return your response in the following JSON format:
-{{{{
-  "campaign_name": "Your campaign name here",
-  "subject_line": "Your subject line here",
-  "html": "Complete HTML template here"
-}}}}
-
-Return ONLY valid JSON, no other text or explanations."""),
-    ("human", "Generate the campaign name, subject line, and email template now.")
+CAMPAIGN BRIEF:
+{campaign_description}
+
+Generate the campaign name and subject line now.""")
 ])
 
-# Email Template Update Prompt
-EMAIL_UPDATE_PROMPT = ChatPromptTemplate.from_messages([
-    ("system", """You are an expert email template editor for {business_name}.
+# Email Template Update Prompt. The editing instructions are a constant
+# SystemMessage (merge tags below are literal); business details, reference
+# templates and the current HTML (the largest, most volatile parts) go in the
+# human message, after everything that is shared between edits.
+EMAIL_UPDATE_SYSTEM_PROMPT = """You are an expert email template editor. The business, its location context, social profile links, available merge tags, reference templates, any new stock images, the current email HTML and the user's change request are given in the user message.
+
+TASK: Update the CURRENT EMAIL HTML according to the user's change request.
+
+REQUIREMENTS (each applies to the whole email):
+1. **Change only what was asked**: keep the structure, branding, images, logos, colors, fonts, button styles and spacing unless the request asks (or clearly implies, e.g. "make it more engaging") otherwise. New or rewritten content should be engaging and relevant; keep the email medium length (around 300-500 words).
+2. **Structure**: all content and images come before the closing/signature, which is the last meaningful content. After it only the footer: company info, social links and the unsubscribe link <a href="{{unsubscribe_link}}" target="_blank">Unsubscribe</a>, which must always be present.
+3. **Social links**: include every link from SOCIAL PROFILE LINKS (never ones from existing templates) with its image_url icon, just before the signature; omit the block if none are provided.
+4. **Images**: for new or changed images use ONLY the NEW PEXELS IMAGES (if provided), never placeholder images, and never show photographer names or photo credits.
+5. **Merge tags**: when the user asks for personalization, add merge tags using the EXACT values from AVAILABLE MERGE TAGS wrapped in double curly braces; they are the only template variables allowed. If a requested tag doesn't exist, use the closest available one. Common patterns: {{contact.properties.first_name default="there"}}, {{location.name}}, {{location.website}}, {{location.address}}, {{location.online_booking_url}}.
+6. **HTML**: valid, mobile-responsive, email-client compatible markup with inline CSS only; no script, iframe or other unsafe tags.
+7. **Section edits**: if the CURRENT EMAIL HTML is marked as a SECTION, it is the only part of the email the request concerns and the rest (which already meets these rules) stays as is. Return only that updated table row (<tr>...</tr>), not a whole email.
+
+EXAMPLES of adding merge tags:
+- "add first name to greeting": <p>Hi there,</p> -> <p>Hi {{contact.properties.first_name default="there"}},</p>
+- "personalize the greeting with customer name": <p>Hello valued customer,</p> -> <p>Hello {{contact.properties.first_name default="valued customer"}},</p>
+- "add our website link": <p>Visit our website for more info.</p> -> <p>Visit <a href="{{location.website}}">our website</a> for more info.</p>
+
+Return ONLY the complete updated HTML, no explanations or markdown formatting."""
+
+EMAIL_UPDATE_PROMPT: Final = ChatPromptTemplate.from_messages([
+    SystemMessage(content=EMAIL_UPDATE_SYSTEM_PROMPT),
+    ("human", """BUSINESS: {business_name}
 
 LOCATION CONTEXT:
 {location_context}
@@ -434,21 +416,6 @@ SOCIAL PROFILE LINKS (use ONLY these valid links):
 AVAILABLE MERGE TAGS (personalization/dynamic tags):
 {merge_tags}
 
-MERGE TAG USAGE RULES (CRITICAL):
-1. **When user requests personalization**, ADD the appropriate merge tags to the HTML
-2. **Use EXACT merge tag values** from the AVAILABLE MERGE TAGS list above
-3. **Format**: Wrap merge tags in double curly braces like {{{{merge_tag_value}}}}
-4. **Common patterns**:
-   - Contact properties: {{{{contact.properties.first_name default="there"}}}}
-   - Location properties: {{{{location.name}}}}, {{{{location.website}}}}, {{{{location.address}}}}
-   - System tags: {{{{system.unsubscribe_link}}}}
-5. **Only use merge tags that exist** in the AVAILABLE MERGE TAGS list above
-6. **If user asks for a tag that doesn't exist**, find the closest match from available tags
-7. **Examples of valid usage**:
-   - {{{{contact.properties.first_name default="there"}}}} for customer's first name
-   - {{{{location.online_booking_url}}}} for booking links
-   - {{{{location.address}}}} for business address
-
 REFERENCE TEMPLATES (for inspiration when making major changes):
 {reference_templates}
 {pexels_images}
@@ -458,57 +425,67 @@ CURRENT EMAIL HTML:
 USER'S CHANGE REQUEST:
 {user_feedback}
 
-TASK:
-Update the provided existing email HTML based on the user's specific change request.
-
-REQUIREMENTS:
-1. **Preserve visual design by default**: Keep colors, fonts, button styles, spacing consistent unless explicitly requested to change
-   - Maintain color palette for backgrounds, text, buttons
-   - Keep font families, sizes, weights consistent
-   - Preserve button styling approach
-   - Keep spacing between elements consistent
-2. **Preserve the overall structure and branding** of the existing email
-3. **Make ONLY the changes requested by the user** - do not make unnecessary modifications
-4. **Maintain proper HTML structure and inline CSS**
-5. **Feel free to improve the design** if the user's request implies it (e.g., "make it more engaging", "improve the layout")
-6. **Ensure the updated email remains professional and email-client compatible**
-7. **Generate ONLY valid HTML email code** (no markdown, no explanations)
-8. **If updating content, make it engaging and relevant**
-9. **Preserve any existing images, logos, or branding elements** unless asked to change them
-10. **Maintain mobile responsiveness**
-11. **If user requests image changes/additions**, use ONLY the images from the NEW PEXELS IMAGES section above (if provided) - these are contextually relevant to the user's request
-
-CRITICAL REQUIREMENTS:
-- ALWAYS include the unsubscribe link: <a href="{{{{unsubscribe_link}}}}" target="_blank">Unsubscribe</a>
-- **USE merge tags from AVAILABLE MERGE TAGS section when requested by user** - these are the ONLY template variables allowed
-- Do NOT include unsafe tags like Script, iframe
-- Use inline CSS only for all styling to ensure compatibility across email clients
-- Keep all required elements: unsubscribe link, company info, social links
-- **DO NOT display photographer names or credits** - Do NOT add any text like "Photo by [photographer]" anywhere in the email
-- **Maintain proper email structure**: All content and images must come BEFORE the closing/signature
-- Closing/signature should be the last meaningful content before footer elements (footer = company info, social links, unsubscribe)
-- Social media links must be used from SOCIAL PROFILE LINKS section and not from the existing email templates
-- Must include all the social media links from the SOCIAL PROFILE LINKS section just before signature
-- If no social media links are provided, do not include the social links block
-- Use the social links icons from the SOCIAL PROFILE LINKS section which are provided as image_url and add respective url.
-- Multiple content blocks: Feel free to add any of text blocks, image+text blocks, video+text blocks in the MAIN CONTENT area (before signature)
-- Create medium size email template which has around 300-500 words of content
-- Must not add any placeholder images. Only valid images should be added.
-
-EXAMPLE - How to add merge tags when user requests personalization:
-
-User request: "add first name to greeting"
-BEFORE: <p>Hi there,</p>
-AFTER: <p>Hi {{{{contact.properties.first_name default="there"}}}},</p>
-
-User request: "personalize the greeting with customer name"
-BEFORE: <p>Hello valued customer,</p>
-AFTER: <p>Hello {{{{contact.properties.first_name default="valued customer"}}}},</p>
-
-User request: "add our website link"
-BEFORE: <p>Visit our website for more info.</p>
-AFTER: <p>Visit <a href="{{{{location.website}}}}">our website</a> for more info.</p>
-
-Return ONLY the complete updated HTML, no explanations or markdown formatting."""),
-    ("human", "Update the email template now based on the user's request.")
+Update the email template now based on the user's request.""")
+])
+
+
+@lru_cache(maxsize=512)
+def email_update_template_for_location(business_name: str, location_context: str) -> ChatPromptTemplate:
+    """
+    Return EMAIL_UPDATE_PROMPT with a business's name and location context
+    bound, so repeated edits for the same business reuse one template.
+    
+    Args:
+        business_name: Business name
+        location_context: Formatted location context for the business
+        
+    Returns:
+        ChatPromptTemplate taking the social links, merge tags, reference
+        templates, images, current HTML and user feedback
+    """
+    return EMAIL_UPDATE_PROMPT.partial(
+        business_name=business_name,
+        location_context=location_context
+    )
+
+
+# Prompt for deciding whether an email change request needs new stock images.
+# Used with structured output (ImageAnalysis), so no JSON format is described.
+IMAGE_ANALYSIS_SYSTEM_PROMPT = """Analyze the user's change request for an email template and determine if new images from stock photography are needed, i.e. whether the user wants to add, change, or update images. If so, provide a focused 2-4 word search query for finding relevant stock images.
+
+Examples:
+- "change the hero image to something about yoga" → needs images, query "yoga class"
+- "add a fitness image at the top" → needs images, query "fitness workout"
+- "make the text bigger and bold" → no images needed
+- "fix the grammar in the first paragraph" → no images needed
+- "replace the beach photo with mountains" → needs images, query "mountain landscape"
+"""
+
+IMAGE_ANALYSIS_PROMPT: Final = ChatPromptTemplate.from_messages([
+    SystemMessage(content=IMAGE_ANALYSIS_SYSTEM_PROMPT),
+    ("human", "User's change request: {user_request}")
+])
+
+
+# Prompt for parsing a requested change to the campaign schedule
+SCHEDULE_PARSE_SYSTEM_PROMPT = """You are a schedule parsing assistant. The current schedule, the location's timezone and the user's change request are given in the user message.
+
+Parse the user's request and provide the updated schedule datetime.
+Return ONLY the new datetime in ISO 8601 format with timezone offset.
+
+FORMAT: YYYY-MM-DDTHH:MM:SS+TZ:TZ
+EXAMPLE: 2025-11-28T14:15:00+05:30
+
+Use the location's timezone offset from the LOCATION TIMEZONE field.
+Return ONLY the datetime string in this exact format, no explanations or additional text."""
+
+SCHEDULE_PARSE_PROMPT: Final = ChatPromptTemplate.from_messages([
+    SystemMessage(content=SCHEDULE_PARSE_SYSTEM_PROMPT),
+    ("human", """CURRENT SCHEDULE: {current_schedule}
+
+LOCATION TIMEZONE: {location_timezone}
+
+USER'S CHANGE REQUEST: {schedule_feedback}
+
+Parse the schedule change now.""")
 ])
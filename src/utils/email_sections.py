@@ -0,0 +1,131 @@
+"""
+Utility functions for editing one section of an email template
+
+Most change requests touch a single, easily identified part of the email (the
+greeting, the signature, the footer, the button). find_email_section() locates
+the table row holding it so only that row is sent to the LLM and spliced back,
+instead of the whole 10-30 KB template.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Optional
+
+# Section -> (words in the request that target it, pattern marking it in the email)
+SECTIONS = {
+    "greeting": (
+        ("greeting", "salutation", "first name", "say hi", "say hello"),
+        re.compile(r"\b(hi|hello|hey|dear)\b", re.IGNORECASE)
+    ),
+    "signature": (
+        ("signature", "sign-off", "sign off", "closing line"),
+        re.compile(r"\b(warm wishes|best wishes|kind regards|best regards|sincerely|cheers)\b", re.IGNORECASE)
+    ),
+    "footer": (
+        ("footer", "unsubscribe"),
+        re.compile(r"\bunsubscribe\b", re.IGNORECASE)
+    ),
+    "button": (
+        ("button", "cta", "call to action", "call-to-action"),
+        # Buttons are links with a background
+        re.compile(r"<a\b[^>]*background", re.IGNORECASE)
+    )
+}
+
+# Requests mentioning these change the email as a whole
+GLOBAL_WORDS = re.compile(
+    r"\b(all|every|entire|whole|overall|layout|design|tone|rewrite|images?|photos?|sections?)\b",
+    re.IGNORECASE
+)
+
+# Sections larger than this share of the email are sent whole anyway
+MAX_SECTION_SHARE = 0.5
+
+
+class _RowParser(HTMLParser):
+    """Records the character span and text of every <tr> in an email"""
+
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self._html = html
+        # getpos() counts lines by "\n" only
+        self._line_offsets = [0] + [m.end() for m in re.finditer("\n", html)]
+        self._open = []
+        self.rows = []
+
+    def _offset(self) -> int:
+        line, col = self.getpos()
+        return self._line_offsets[line - 1] + col
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._open.append({"start": self._offset(), "text": []})
+
+    def handle_endtag(self, tag):
+        if tag == "tr" and self._open:
+            row = self._open.pop()
+            end = self._html.find(">", self._offset()) + 1
+            row["end"] = end
+            row["text"] = " ".join(row["text"])
+            self.rows.append(row)
+            # Text of a nested row also belongs to the rows around it
+            if self._open:
+                self._open[-1]["text"].append(row["text"])
+
+    def handle_data(self, data):
+        if self._open and data.strip():
+            self._open[-1]["text"].append(data.strip())
+
+
+def find_email_section(html: str, user_feedback: str) -> Optional[tuple[int, int]]:
+    """
+    Find the one table row a change request is about.
+
+    Args:
+        html: Current email HTML
+        user_feedback: The user's change request
+
+    Returns:
+        (start, end) character span of the smallest matching <tr>, or None if
+        the request isn't clearly about a single section (send the whole email)
+    """
+    feedback = user_feedback.lower()
+    targets = [
+        name for name, (words, _) in SECTIONS.items()
+        if any(word in feedback for word in words)
+    ]
+    if len(targets) != 1 or GLOBAL_WORDS.search(feedback):
+        return None
+    marker = SECTIONS[targets[0]][1]
+
+    parser = _RowParser(html)
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        return None
+
+    matches = []
+    for row in parser.rows:
+        if row.get("end", 0) <= row["start"]:
+            continue
+        raw = html[row["start"]:row["end"]]
+        content = raw if targets[0] == "button" else row["text"]
+        if marker.search(content):
+            matches.append((row["end"] - row["start"], row["start"], row["end"]))
+
+    if not matches:
+        return None
+
+    size, start, end = min(matches)
+    # Several distinct sections match (e.g. two buttons): the request is ambiguous
+    innermost = [m for m in matches if not any(o[1] > m[1] and o[2] < m[2] for o in matches)]
+    if len(innermost) > 1 or size > len(html) * MAX_SECTION_SHARE:
+        return None
+    return start, end
+
+
+def is_section_html(html: str) -> bool:
+    """Return True if an LLM response is a single table row (not a whole email)"""
+    html = html.strip().lower()
+    return html.startswith("<tr") and html.endswith("</tr>") and "<body" not in html
@@ -0,0 +1,141 @@
+"""
+Utility functions for summarizing reference email templates
+
+A reference email is often 5-20 KB of HTML, most of it markup the LLM only
+needs a few facts from. style_fingerprint() distills one into its brand colors,
+fonts, logo/image URLs, button styles, block layout and a text sample.
+References sent as full HTML are shrunk with compact_html() instead.
+"""
+
+import re
+import json
+from collections import Counter
+from functools import lru_cache
+from html.parser import HTMLParser
+
+_COLOR_RE = re.compile(r"#[0-9a-fA-F]{6}\b|#[0-9a-fA-F]{3}\b|rgba?\([^)]*\)")
+_FONT_RE = re.compile(r"font-family\s*:\s*([^;\"]+)", re.IGNORECASE)
+_BUTTON_BG_RE = re.compile(r"background(?:-color)?\s*:", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+# Comments other than Outlook conditionals (<!--[if mso]>...)
+_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+# Indentation between tags (a space between inline tags on one line is kept)
+_BETWEEN_TAGS_RE = re.compile(r">\s*\n\s*<")
+
+# Elements recorded in the layout outline
+_BLOCK_TAGS = {"img", "h1", "h2", "h3", "p", "table", "ul", "hr"}
+
+MAX_COLORS = 8
+MAX_FONTS = 3
+MAX_IMAGES = 6
+MAX_BUTTON_STYLES = 2
+MAX_LAYOUT_BLOCKS = 40
+MAX_TEXT_SAMPLE = 400
+
+
+class _StyleParser(HTMLParser):
+    """Collects images, button styles, block layout and visible text from an email"""
+
+    def __init__(self):
+        super().__init__()
+        self.images = []
+        self.logo_url = ""
+        self.button_styles = Counter()
+        self.layout = []
+        self.text = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        style = attrs.get("style") or ""
+
+        if tag in ("style", "script", "head"):
+            self._skip_depth += 1
+            return
+
+        if tag == "img" and attrs.get("src"):
+            src = attrs["src"]
+            hint = f"{src} {attrs.get('alt', '')} {attrs.get('class', '')}".lower()
+            if not self.logo_url and "logo" in hint:
+                self.logo_url = src
+            if src not in self.images:
+                self.images.append(src)
+
+        if tag == "a" and _BUTTON_BG_RE.search(style):
+            self.button_styles[_WHITESPACE_RE.sub(" ", style).strip()] += 1
+            self._add_block("button")
+        elif tag in _BLOCK_TAGS:
+            self._add_block(tag)
+
+    def handle_endtag(self, tag):
+        if tag in ("style", "script", "head") and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth and data.strip():
+            self.text.append(data.strip())
+
+    def _add_block(self, kind: str):
+        """Record a block, collapsing consecutive repeats (e.g. p x3)"""
+        if self.layout and self.layout[-1][0] == kind:
+            self.layout[-1][1] += 1
+        else:
+            self.layout.append([kind, 1])
+
+
+@lru_cache(maxsize=128)
+def style_fingerprint(html: str) -> str:
+    """
+    Summarize a reference email's styling as compact, deterministic JSON.
+
+    Args:
+        html: Email HTML
+
+    Returns:
+        JSON string with brand_colors, fonts, logo_url, image_urls,
+        button_styles, layout and text_sample (sorted keys, no extra whitespace)
+    """
+    parser = _StyleParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # Malformed markup; keep whatever was collected
+        pass
+
+    colors = Counter(c.lower().replace(" ", "") for c in _COLOR_RE.findall(html))
+    fonts = Counter(
+        _WHITESPACE_RE.sub(" ", f).strip().strip("'\"")
+        for f in _FONT_RE.findall(html)
+    )
+    layout = [
+        kind if count == 1 else f"{kind} x{count}"
+        for kind, count in parser.layout[:MAX_LAYOUT_BLOCKS]
+    ]
+    text_sample = " ".join(parser.text)[:MAX_TEXT_SAMPLE]
+
+    return json.dumps({
+        "brand_colors": [c for c, _ in colors.most_common(MAX_COLORS)],
+        "fonts": [f for f, _ in fonts.most_common(MAX_FONTS)],
+        "logo_url": parser.logo_url,
+        "image_urls": parser.images[:MAX_IMAGES],
+        "button_styles": [s for s, _ in parser.button_styles.most_common(MAX_BUTTON_STYLES)],
+        "layout": layout,
+        "text_sample": text_sample
+    }, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_html(html: str) -> str:
+    """
+    Drop comments and collapse whitespace in email HTML.
+    
+    Args:
+        html: Email HTML
+        
+    Returns:
+        The same markup with fewer tokens
+    """
+    html = _COMMENT_RE.sub("", html)
+    html = _BETWEEN_TAGS_RE.sub("><", html)
+    return _WHITESPACE_RE.sub(" ", html).strip()
+
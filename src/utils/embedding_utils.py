@@ -0,0 +1,143 @@
+"""
+Utility functions for computing text embeddings with dynamic batching
+"""
+
+import os
+import asyncio
+import threading
+from typing import List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class BatchingEmbedder:
+    """
+    Coalesces embed_query calls that arrive within a short window into a
+    single embed_documents call, so concurrent lookups share one forward pass.
+    """
+
+    def __init__(self, inner, max_batch: int = 32, max_wait: float = 0.005):
+        """
+        Args:
+            inner: LangChain Embeddings instance (e.g. HuggingFaceEmbeddings)
+            max_batch: Maximum number of texts embedded in one forward pass
+            max_wait: Seconds to wait for more texts before flushing a batch
+        """
+        self._inner = inner
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed_query(self, text: str) -> List[float]:
+        """
+        Embed a single text, batched with any other pending requests.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts in one forward pass, off the event loop.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per text
+        """
+        return await asyncio.to_thread(self._inner.embed_documents, texts)
+
+    async def _run(self):
+        """Drain the queue in batches of up to max_batch texts"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait
+
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                # Model inference is CPU/GPU bound, keep it off the event loop
+                vectors = await asyncio.to_thread(self._inner.embed_documents, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+
+_embedder: Optional[BatchingEmbedder] = None
+# get_embedder may be called from worker threads; load the model only once
+_embedder_lock = threading.Lock()
+
+
+def get_embedder() -> BatchingEmbedder:
+    """
+    Return the process-wide batching embedder, loading the model on first use.
+
+    Returns:
+        BatchingEmbedder wrapping HuggingFaceEmbeddings
+
+    Environment Variables:
+        EMBEDDING_MODEL: Sentence-transformers model name
+            (default: "sentence-transformers/all-MiniLM-L6-v2")
+        EMBEDDING_NUM_THREADS: Number of torch CPU threads (default: torch's choice)
+    """
+    global _embedder
+
+    with _embedder_lock:
+        if _embedder is None:
+            _embedder = _load_embedder()
+
+    return _embedder
+
+
+def _load_embedder() -> BatchingEmbedder:
+    """Build the batching embedder (imports torch and loads the model)"""
+    # Heavy imports are deferred until embeddings are actually needed
+    import torch
+    from langchain_huggingface import HuggingFaceEmbeddings
+
+    num_threads = os.getenv("EMBEDDING_NUM_THREADS")
+    if num_threads:
+        torch.set_num_threads(int(num_threads))
+
+    model_kwargs = {"device": "cpu"}
+    if torch.cuda.is_available():
+        model_kwargs = {
+            "device": "cuda",
+            "model_kwargs": {"torch_dtype": torch.float16}
+        }
+
+    inner = HuggingFaceEmbeddings(
+        model_name=os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"),
+        model_kwargs=model_kwargs
+    )
+    return BatchingEmbedder(inner, max_batch=32, max_wait=0.005)
@@ -0,0 +1,72 @@
+"""
+Utility functions for post-processing generated FredQL queries
+"""
+
+import re
+
+# Minutes per duration unit ("mo" is 30 days, "y" is 365 days)
+DURATION_UNITS = {
+    "m": 1,
+    "h": 60,
+    "d": 1440,
+    "w": 10080,
+    "mo": 43200,
+    "y": 525600
+}
+
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(mo|m|h|d|w|y)\s*$", re.IGNORECASE)
+
+# Duration fields the LLM may emit -> the minute fields FredQL expects
+DURATION_FIELDS = {
+    "last_occurred_within": "last_occurred_within_minutes_ago",
+    "first_occurred_within": "first_occurred_within_minutes_ago"
+}
+
+
+def to_minutes(duration) -> int | None:
+    """
+    Convert a duration such as "30m", "2h", "7d", "2w", "6mo" or "1y" to minutes.
+
+    Args:
+        duration: Duration string (plain numbers are taken as minutes)
+
+    Returns:
+        Whole number of minutes, or None if the duration can't be parsed
+    """
+    if isinstance(duration, bool):
+        return None
+    if isinstance(duration, (int, float)):
+        return int(duration)
+
+    match = _DURATION_RE.match(str(duration))
+    if not match:
+        return None
+
+    value, unit = match.groups()
+    return int(float(value) * DURATION_UNITS[unit.lower()])
+
+
+def convert_durations(fredql_query):
+    """
+    Rewrite duration fields (e.g. "last_occurred_within": "7d") in a FredQL
+    query into the *_minutes_ago fields the API expects, in place.
+
+    Args:
+        fredql_query: FredQL query (nested lists of filter dicts)
+
+    Returns:
+        The same query, for convenience
+    """
+    if isinstance(fredql_query, list):
+        for item in fredql_query:
+            convert_durations(item)
+    elif isinstance(fredql_query, dict):
+        for field, minutes_field in DURATION_FIELDS.items():
+            if field in fredql_query:
+                minutes = to_minutes(fredql_query[field])
+                # Unparseable values are left as-is for the API to reject
+                if minutes is not None:
+                    del fredql_query[field]
+                    fredql_query[minutes_field] = minutes
+
+    return fredql_query
@@ -3,9 +3,19 @@ Utility functions for fetching images for email templates via Pexels API
 """
 
 import os
+import time
+import asyncio
 import httpx
+from collections import OrderedDict
 from typing import Optional
 
+# Seconds a search result is reused by get_cached_pexels_images
+PEXELS_CACHE_TTL = 3600.0
+PEXELS_CACHE_SIZE = 128
+
+# (query, count, api_key) -> (expires_at, task fetching the result), in LRU order
+_PEXELS_CACHE: OrderedDict = OrderedDict()
+
 
 async def get_pexels_images(query: str, count: int = 3, api_key: Optional[str] = None) -> dict:
     """
@@ -100,3 +110,41 @@ async def get_pexels_images(query: str, count: int = 3, api_key: Optional[str] =
             "message": str(e)
         }
 
+
+async def get_cached_pexels_images(query: str, count: int = 3, api_key: Optional[str] = None) -> dict:
+    """
+    Fetch images from Pexels, reusing a recent result for the same search.
+    
+    Used when generating a campaign email, so the images prefetched while smart
+    lists are matched are reused. Explicit requests for new images should call
+    get_pexels_images directly.
+    
+    Args:
+        query: Search query describing the desired images
+        count: Number of images to return (1-15, default: 3)
+        api_key: Pexels API key (optional, uses env var if not provided)
+    
+    Returns:
+        Same as get_pexels_images; error results are not reused
+    """
+    key = (query, count, api_key)
+    now = time.monotonic()
+    entry = _PEXELS_CACHE.get(key)
+    if entry is None or entry[0] <= now:
+        # Cache the task, not the result, so concurrent callers share one request
+        entry = (now + PEXELS_CACHE_TTL, asyncio.ensure_future(get_pexels_images(query, count, api_key)))
+        _PEXELS_CACHE[key] = entry
+        while len(_PEXELS_CACHE) > PEXELS_CACHE_SIZE:
+            _PEXELS_CACHE.popitem(last=False)
+    else:
+        _PEXELS_CACHE.move_to_end(key)
+    
+    try:
+        # Shield so one cancelled caller doesn't cancel the request for the others
+        result = await asyncio.shield(entry[1])
+    except Exception as e:
+        result = {"error": "Unexpected error", "message": str(e)}
+    
+    if "error" in result and _PEXELS_CACHE.get(key) is entry:
+        del _PEXELS_CACHE[key]
+    return result
@@ -0,0 +1,191 @@
+"""
+Deterministic response cache for LLM calls
+
+Responses are keyed by a sha256 of (model, rendered messages, temperature),
+so an identical request is answered without an LLM round-trip. When REDIS_URL is set,
+exact-match results are also shared through Redis, so they survive restarts and
+are reused across server processes. Only deterministic calls (temperature 0)
+are cached by default; sampled outputs are expected to differ between runs,
+unless the caller opts in (e.g. to replay an identical email edit).
+"""
+
+import os
+import copy
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """In-memory LRU map of cache key -> parsed LLM result"""
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Args:
+            max_entries: Maximum number of cached results before the oldest is evicted
+        """
+        self._max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for key, or None"""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store a result, evicting the least recently used entry if full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results"""
+        self._entries.clear()
+
+
+class RedisLLMCache:
+    """Redis-backed map of cache key -> JSON-serializable LLM result"""
+
+    def __init__(self, url: str, ttl: int = 86400):
+        """
+        Args:
+            url: Redis connection URL (e.g. "redis://localhost:6379/0")
+            ttl: Seconds a cached result is kept
+        """
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._ttl = ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached result for key, or None (also if Redis is unreachable)"""
+        try:
+            raw = await self._client.get(f"llm:{key}")
+        except Exception as e:
+            logger.warning("✗ Redis LLM cache read failed: %s", e)
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any):
+        """Store a result; results that aren't JSON-serializable are skipped"""
+        try:
+            payload = json.dumps(value)
+        except TypeError:
+            return
+        try:
+            await self._client.set(f"llm:{key}", payload, ex=self._ttl)
+        except Exception as e:
+            logger.warning("✗ Redis LLM cache write failed: %s", e)
+
+    async def aclose(self):
+        """Close the Redis connection pool"""
+        await self._client.aclose()
+
+
+_cache = LLMCache(max_entries=int(os.getenv("LLM_CACHE_SIZE", "256")))
+
+# Shared layer is opt-in: only used when REDIS_URL is configured
+_REDIS_URL = os.getenv("REDIS_URL")
+_redis_cache = RedisLLMCache(_REDIS_URL, int(os.getenv("LLM_CACHE_TTL", "86400"))) if _REDIS_URL else None
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM response cache"""
+    return _cache
+
+
+async def aclose_llm_cache():
+    """Close the Redis LLM cache connection, if configured"""
+    if _redis_cache is not None:
+        await _redis_cache.aclose()
+
+
+def model_id(llm) -> str:
+    """Return the model name of a LangChain chat model"""
+    return getattr(llm, "model_name", None) or getattr(llm, "model", "") or ""
+
+
+def is_cacheable(llm) -> bool:
+    """Only deterministic (temperature 0) calls are cached"""
+    # ChatGroq stores temperature 0 as 1e-8
+    return (getattr(llm, "temperature", None) or 0) < 1e-6
+
+
+def cache_key(model: str, messages: list, temperature: float = 0) -> str:
+    """
+    Build the cache key for an LLM request.
+
+    Args:
+        model: Model name
+        messages: Rendered messages as (role, content) pairs
+        temperature: Sampling temperature
+
+    Returns:
+        Hex sha256 digest identifying the request
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+async def cached_llm_call(
+    llm,
+    prompt,
+    inputs: dict,
+    call: Callable[[], Awaitable[Any]],
+    allow_sampled: bool = False
+) -> Any:
+    """
+    Return the cached result for this prompt/inputs, or run call() and cache it.
+
+    Args:
+        llm: Chat model the call runs against
+        prompt: Prompt template (chat or plain text) the call renders
+        inputs: Prompt variables
+        call: Coroutine function performing the actual LLM call and parsing; its
+            result must be JSON-serializable to be shared through Redis
+        allow_sampled: Also cache calls made at a non-zero temperature, for steps
+            where an identical request should get the identical answer
+
+    Returns:
+        Parsed result (a copy when served from cache)
+    """
+    if not (allow_sampled or is_cacheable(llm)):
+        return await call()
+
+    # format_prompt works for both chat and plain-text templates
+    messages = [(m.type, m.content) for m in prompt.format_prompt(**inputs).to_messages()]
+    key = cache_key(model_id(llm), messages, getattr(llm, "temperature", 0) or 0)
+
+    cached = _cache.get(key)
+    if cached is not None:
+        logger.debug("✓ Using cached LLM response")
+        return copy.deepcopy(cached)
+
+    if _redis_cache is not None:
+        cached = await _redis_cache.get(key)
+        if cached is not None:
+            logger.debug("✓ Using shared cached LLM response")
+            _cache.set(key, copy.deepcopy(cached))
+            return cached
+
+    result = await call()
+    # Error results (e.g. {"error": "manual_creation_required"}) are retried next time
+    if result is not None and not (isinstance(result, dict) and "error" in result):
+        _cache.set(key, copy.deepcopy(result))
+        if _redis_cache is not None:
+            await _redis_cache.set(key, result)
+    return result
@@ -3,17 +3,76 @@ Utility functions for LLM initialization
 """
 
 import os
+import logging
+import importlib.util
+from typing import Optional
+import httpx
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-def get_llm(temperature: float = 0.7):
+_LLM_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """
+    Return the AsyncClient shared by all LLM instances, creating it on first use.
+    
+    Sharing one pool keeps provider connections (and TLS sessions) alive across
+    LLM instances and lets concurrent calls multiplex over HTTP/2.
+    
+    Returns:
+        httpx.AsyncClient with HTTP/2 (when h2 is installed) and keep-alive pooling
+    """
+    global _LLM_HTTP_CLIENT
+    
+    if _LLM_HTTP_CLIENT is None or _LLM_HTTP_CLIENT.is_closed:
+        _LLM_HTTP_CLIENT = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            # The provider SDKs set per-request timeouts; this only bounds pool waits
+            timeout=httpx.Timeout(600.0, pool=5.0)
+        )
+    
+    return _LLM_HTTP_CLIENT
+
+
+async def aclose_llm_http_client():
+    """Close the shared LLM AsyncClient, if it was created"""
+    global _LLM_HTTP_CLIENT
+    
+    if _LLM_HTTP_CLIENT is not None:
+        await _LLM_HTTP_CLIENT.aclose()
+        _LLM_HTTP_CLIENT = None
+
+
+# Workflow steps that can be routed to their own model via
+# OPEN_AI_MODEL_<TASK> / GROQ_MODEL_<TASK> (e.g. GROQ_MODEL_PARSE)
+LLM_TASKS = ("parse", "update", "match", "fredql", "email_generation", "email_meta", "email_update", "schedule")
+
+# Steps whose output should vary between runs; every other step runs at
+# temperature 0 so identical requests can be served from the LLM cache
+CREATIVE_TASKS = ("email_generation", "email_meta", "email_update")
+
+
+def _model_name(prefix: str, default: str, task: Optional[str]) -> str:
+    """Return the model for a task, falling back to the provider's default model"""
+    if task:
+        task_model = os.getenv(f"{prefix}_{task.upper()}")
+        if task_model:
+            return task_model
+    return os.getenv(prefix, default)
+
+
+def get_llm(temperature: float = 0.7, task: Optional[str] = None):
     """
     Initialize and return the appropriate LLM based on environment configuration.
     
     Args:
         temperature: Temperature setting for the LLM (default: 0.7)
+        task: Workflow step (one of LLM_TASKS) whose model override to use, if set
     
     Returns:
         LLM instance (either ChatOpenAI or ChatGroq)
@@ -22,8 +81,10 @@ def get_llm(temperature: float = 0.7):
         USE_OPEN_AI_MODEL: "true" to use OpenAI, "false" to use Groq
         OPEN_AI_KEY: OpenAI API key (required if USE_OPEN_AI_MODEL=true)
         OPEN_AI_MODEL: OpenAI model name (e.g., "gpt-4", "gpt-3.5-turbo")
+        OPEN_AI_MODEL_<TASK>: OpenAI model for one task (e.g., OPEN_AI_MODEL_PARSE="gpt-4o-mini")
         GROQ_API_KEY: Groq API key (required if USE_OPEN_AI_MODEL=false)
         GROQ_MODEL: Groq model name (e.g., "openai/gpt-oss-120b", "llama-3.1-70b-versatile")
+        GROQ_MODEL_<TASK>: Groq model for one task (e.g., GROQ_MODEL_UPDATE="llama-3.1-8b-instant")
     """
     use_openai = os.getenv("USE_OPEN_AI_MODEL", "false").lower() == "true"
     
@@ -32,7 +93,7 @@ def get_llm(temperature: float = 0.7):
         from langchain_openai import ChatOpenAI
         
         api_key = os.getenv("OPEN_AI_KEY")
-        model_name = os.getenv("OPEN_AI_MODEL", "gpt-4")
+        model_name = _model_name("OPEN_AI_MODEL", "gpt-4", task)
         
         if not api_key:
             raise ValueError("OPEN_AI_KEY environment variable is required when USE_OPEN_AI_MODEL=true")
@@ -40,14 +101,17 @@ def get_llm(temperature: float = 0.7):
         return ChatOpenAI(
             temperature=temperature,
             model_name=model_name,
-            openai_api_key=api_key
+            openai_api_key=api_key,
+            http_async_client=get_llm_http_client(),
+            # Report token usage (incl. cached prompt tokens) on streamed responses
+            stream_usage=True
         )
     else:
         # Use Groq
         from langchain_groq import ChatGroq
         
         api_key = os.getenv("GROQ_API_KEY")
-        model_name = os.getenv("GROQ_MODEL", "openai/gpt-oss-120b")
+        model_name = _model_name("GROQ_MODEL", "openai/gpt-oss-120b", task)
         
         if not api_key:
             raise ValueError("GROQ_API_KEY environment variable is required when USE_OPEN_AI_MODEL=false")
@@ -55,6 +119,69 @@ def get_llm(temperature: float = 0.7):
         return ChatGroq(
             temperature=temperature,
             model_name=model_name,
-            groq_api_key=api_key
+            groq_api_key=api_key,
+            http_async_client=get_llm_http_client()
         )
 
+
+def get_task_llms(temperature: float = 0.7) -> dict:
+    """
+    Return an LLM for every workflow step in LLM_TASKS.
+    
+    Steps in CREATIVE_TASKS use the given temperature, all others run at 0.
+    Steps resolving to the same model and temperature share one instance.
+    
+    Args:
+        temperature: Temperature setting for the creative steps (default: 0.7)
+    
+    Returns:
+        Dict mapping task name to LLM instance
+    """
+    by_model = {}
+    llms = {}
+    for task in LLM_TASKS:
+        task_temperature = temperature if task in CREATIVE_TASKS else 0.0
+        llm = get_llm(temperature=task_temperature, task=task)
+        model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+        llms[task] = by_model.setdefault((model, task_temperature), llm)
+    return llms
+
+
+def with_prompt_cache_key(llm, key: str):
+    """
+    Tag an LLM's requests with a prompt cache key, so requests sharing a long
+    prompt prefix (e.g. the same location's FredQL schema or reference emails)
+    are routed to the same provider cache.
+    
+    Only OpenAI accepts the key; other LLMs are returned unchanged (Groq
+    caches prompt prefixes without one).
+    
+    Args:
+        llm: Language model instance
+        key: Cache key shared by requests with the same prompt prefix
+    
+    Returns:
+        The LLM, bound to the cache key when supported
+    """
+    from langchain_openai import ChatOpenAI
+    
+    if isinstance(llm, ChatOpenAI):
+        return llm.bind(prompt_cache_key=key)
+    return llm
+
+
+def log_prompt_cache_usage(label: str, message) -> None:
+    """
+    Log how many prompt tokens of an LLM response were served from the
+    provider's prompt cache.
+    
+    Args:
+        label: Workflow step the response belongs to
+        message: AIMessage (or final streamed chunk) carrying usage_metadata
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if not usage:
+        return
+    
+    cached = (usage.get("input_token_details") or {}).get("cache_read", 0)
+    logger.info("[Prompt Cache] %s: %d/%d prompt tokens cached", label, cached, usage.get("input_tokens", 0))
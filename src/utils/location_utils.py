@@ -69,3 +69,49 @@ def format_location_context(location: dict) -> str:
     
     return "- " + "\n- ".join(context_parts)
 
+
+def format_social_links(social_links: list) -> str:
+    """
+    Format social profile links for the email prompts
+    
+    Args:
+        social_links: Social profile link resources from the Frederick API
+        
+    Returns:
+        One "- platform: url" line per link with a URL
+    """
+    lines = [
+        f"- {link.get('attributes', {}).get('platform', '')}: {link['attributes']['url']}"
+        for link in social_links
+        if link.get("attributes", {}).get("url")
+    ]
+    if not lines:
+        return "No social profile links available"
+    return "\n".join(lines)
+
+
+def format_merge_tags(merge_tags: list) -> str:
+    """
+    Format merge tags for the email prompts
+    
+    Args:
+        merge_tags: Merge tag resources from the Frederick API
+        
+    Returns:
+        One line per visible merge tag with its display name and example value
+    """
+    items = []
+    for tag in merge_tags:
+        attrs = tag.get("attributes", {})
+        tag_value = attrs.get("merge_tag_value", "")
+        # Skip hidden tags
+        if not tag_value or attrs.get("hidden", False):
+            continue
+        item = f"- **{{{{{tag_value}}}}}** ({attrs.get('display_name', tag_value)})"
+        if preview_value := attrs.get("preview_value", ""):
+            item += f" - Example: {preview_value}"
+        items.append(item)
+    
+    if not items:
+        return "No merge tags available. Do not use any personalization tags."
+    return "\n".join(items)
@@ -3,8 +3,15 @@ Workflow module for campaign generation
 """
 
 from . import websocket_nodes
-from .websocket_workflow import build_websocket_workflow
 from .executor import WorkflowExecutor
 
 __all__ = ["websocket_nodes", "build_websocket_workflow", "WorkflowExecutor"]
 
+
+def __getattr__(name):
+    # The LangGraph workflow is only needed to draw the graph; import it
+    # (and langgraph) lazily so server startup doesn't pay for it
+    if name == "build_websocket_workflow":
+        from .websocket_workflow import build_websocket_workflow
+        return build_websocket_workflow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
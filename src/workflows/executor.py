@@ -3,18 +3,22 @@ Workflow executor for running campaign generation workflows
 """
 
 import os
+import time
 import asyncio
 from typing import Dict, Any
 from dotenv import load_dotenv
 
-from .websocket_workflow import build_websocket_workflow
 from . import websocket_nodes
 from ..nodes import parse_prompt, process_clarifications
-from ..utils.llm_utils import get_llm
+from ..utils.llm_utils import get_task_llms
 
 # Load environment variables
 load_dotenv()
 
+# Prefetched smart lists older than this are fetched again before matching
+# (same as the get_existing_smart_lists cache TTL)
+SMART_LISTS_MAX_AGE = 60.0
+
 
 class WorkflowExecutor:
     """
@@ -22,16 +26,16 @@ class WorkflowExecutor:
     """
     
     def __init__(self):
-        # Initialize LLM instance based on environment configuration
-        self.llm = get_llm(temperature=0.7)
+        # Initialize LLM instances based on environment configuration; each
+        # workflow step uses its own model if one is configured for it
+        self.llms = get_task_llms(temperature=0.7)
         
         # Client session storage - stores workflow states
         self.client_sessions: Dict[str, Dict[str, Any]] = {}
-        self.client_workflows: Dict[str, Any] = {}  # Store compiled workflow per client
     
     async def process_campaign(self, client_id: str, message: str, connection_manager):
         """
-        Process user message through LangGraph workflow with checkpointing
+        Process user message through the campaign generation workflow
         
         Args:
             client_id: Unique client identifier
@@ -55,28 +59,11 @@ class WorkflowExecutor:
             async def send_msg(msg):
                 await connection_manager.send_message(client_id, msg)
             
-            # Build workflow with WebSocket support (if not already built for this client)
-            if client_id not in self.client_workflows:
-                workflow = build_websocket_workflow(self.llm, send_msg)
-                self.client_workflows[client_id] = workflow
-            else:
-                workflow = self.client_workflows[client_id]
-            
             # Initialize state for new conversation
             initial_state = self._create_initial_state(message, location)
             
-            # Configuration with thread_id for checkpointing
-            config = {"configurable": {"thread_id": client_id}}
-            
-            # Store initial state, location, and credentials
-            self.client_sessions[client_id] = {
-                "state": initial_state.copy(),
-                "location": location,
-                "credentials": credentials
-            }
-            
-            # Execute workflow with checkpointing
-            await self._run_workflow(initial_state, config, client_id, send_msg, location, credentials)
+            # Execute workflow (stores the session state, location, and credentials)
+            await self._run_workflow(initial_state, client_id, send_msg, location, credentials)
             
         except Exception as e:
             import traceback
@@ -127,6 +114,8 @@ class WorkflowExecutor:
             "schedule_confirmed": False,
             "clarifications_needed": [],
             "clarification_responses": {},
+            "clarification_context": "",
+            "prompt_context": {},
             "current_step": "parse_prompt"
         }
     
@@ -138,42 +127,52 @@ class WorkflowExecutor:
             client_id: Client identifier
         """
         # Clear stored session state
-        if client_id in self.client_sessions:
-            del self.client_sessions[client_id]
-        
-        # Clear stored workflow (will be rebuilt on next request)
-        if client_id in self.client_workflows:
-            del self.client_workflows[client_id]
+        self._cleanup_client(client_id)
         
         print(f"Reset state for client {client_id}")
     
-    async def _run_workflow(self, state, config, client_id, send_msg, location: dict = None, credentials: dict = None):
+    async def _run_workflow(self, state, client_id, send_msg, location: dict = None, credentials: dict = None):
         """
         Execute workflow with proper async handling
         
         Args:
             state: Initial workflow state
-            config: LangGraph configuration
             client_id: Client identifier
             send_msg: Async function to send messages
             location: Location data from client
             credentials: API credentials from client
         """
         # Since LangGraph doesn't fully support async nodes in invoke(),
-        # we'll manually execute with checkpointing logic
-        current_state = state.copy()
+        # we'll manually execute with checkpointing logic. The state is freshly
+        # built per request, so steps update it in place rather than a copy
+        current_state = state
         self.client_sessions[client_id] = {
             "state": current_state,
             "location": location,
             "credentials": credentials
         }
         
+        # Start fetching campaign context and smart lists now so they overlap the LLM calls below
+        prefetch = None
+        if current_state.get("location_id"):
+            prefetch = asyncio.create_task(self._prefetch_campaign_context(current_state, location, credentials))
+            self.client_sessions[client_id]["prefetch"] = prefetch
+            self.client_sessions[client_id]["lists_prefetch"] = asyncio.create_task(
+                self._prefetch_smart_lists(current_state, credentials)
+            )
+        
         # Step 1: Parse prompt
         await self._parse_prompt_step(current_state, send_msg, location)
         
         # Step 2: Handle clarifications (loop until all resolved)
         await self._clarification_loop(current_state, send_msg, location)
         
+        # Audience and image queries are final now: warm the FredQL schema and
+        # stock images while smart lists are matched and confirmed
+        self.client_sessions[client_id]["generation_prefetch"] = asyncio.create_task(
+            self._prefetch_generation_inputs(current_state, credentials)
+        )
+        
         # Check if audience is "all_customers" - if so, skip smart list workflow
         audience = current_state.get("audience", "").lower()
         if audience == "all_customers":
@@ -193,12 +192,15 @@ class WorkflowExecutor:
             })
         else:
             # Step 3: Check smart lists
-            await self._check_smart_lists_step(current_state, send_msg, credentials)
+            await self._check_smart_lists_step(current_state, send_msg, client_id, credentials)
             
             # Step 4: Handle smart list selection
             await self._handle_smart_list_selection(current_state, send_msg, location, credentials)
         
         # Step 5: Create campaign and generate email template
+        # (usually long done; makes sure the step reads a warm cache)
+        if prefetch:
+            await prefetch
         await self._create_campaign_step(current_state, send_msg, location, credentials)
         
         # Step 6: Review and refine email template
@@ -212,6 +214,86 @@ class WorkflowExecutor:
         # Workflow complete - cleanup
         self._cleanup_client(client_id)
     
+    async def _prefetch_campaign_context(self, state, location: dict = None, credentials: dict = None):
+        """
+        Warm the cached Frederick GETs used when creating the campaign
+        (social links, reference emails and merge tags) while the LLM parses
+        the prompt. Failures are ignored; the campaign step fetches again if needed.
+        """
+        from ..mcp.campaigns_mcp import get_social_profile_links, get_latest_campaign_emails, get_merge_tags
+        
+        location = location or {}
+        credentials = credentials or {}
+        auth = {
+            "api_key": credentials.get("api_key"),
+            "bearer_token": credentials.get("bearer_token"),
+            "api_url": credentials.get("api_url")
+        }
+        
+        await asyncio.gather(
+            get_social_profile_links(
+                source_platform=location.get("source_platform", ""),
+                source_location_id=location.get("source_location_id", ""),
+                source_customer_id=location.get("source_customer_id", ""),
+                **auth
+            ),
+            get_latest_campaign_emails(state.get("location_id"), **auth),
+            get_merge_tags(state.get("location_id"), **auth),
+            return_exceptions=True
+        )
+    
+    async def _prefetch_generation_inputs(self, state, credentials: dict = None):
+        """
+        Warm the cached lookups that depend on the parsed prompt: the location's
+        contact properties and interaction types (for FredQL generation, unless
+        the campaign goes to all customers) and the stock images for the email.
+        Calls match the later ones exactly so they hit the same cache entries.
+        Failures are ignored; each step fetches again if needed.
+        """
+        from ..mcp.contacts_mcp import get_contact_properties, get_interaction_types
+        from ..utils.image_utils import get_cached_pexels_images
+        
+        credentials = credentials or {}
+        auth = {
+            "api_key": credentials.get("api_key"),
+            "bearer_token": credentials.get("bearer_token"),
+            "api_url": credentials.get("api_url")
+        }
+        location_id = state.get("location_id")
+        
+        image_search_queries = state.get("image_search_queries", [])
+        fetches = [get_cached_pexels_images(
+            query=image_search_queries[0] if image_search_queries else "business professional",
+            count=3
+        )]
+        if location_id and state.get("audience", "").lower() != "all_customers":
+            fetches.append(get_contact_properties(location_id, **auth))
+            fetches.append(get_interaction_types(location_id, **auth))
+        
+        await asyncio.gather(*fetches, return_exceptions=True)
+    
+    async def _prefetch_smart_lists(self, state, credentials: dict = None):
+        """
+        Fetch the location's smart lists while the prompt is parsed and clarified.
+        
+        Returns:
+            (monotonic fetch time, result), or None on failure; the smart list
+            step then fetches on its own
+        """
+        from ..mcp.contacts_mcp import get_existing_smart_lists
+        
+        credentials = credentials or {}
+        try:
+            result = await get_existing_smart_lists(
+                state.get("location_id"),
+                api_key=credentials.get("api_key"),
+                bearer_token=credentials.get("bearer_token"),
+                api_url=credentials.get("api_url")
+            )
+        except Exception:
+            return None
+        return None if "error" in result else (time.monotonic(), result)
+    
     async def _parse_prompt_step(self, state, send_msg, location: dict = None):
         """Parse the user's campaign prompt"""
         await send_msg({
@@ -221,7 +303,7 @@ class WorkflowExecutor:
             "disable_input": True
         })
         
-        parse_result = parse_prompt(state, self.llm, location)
+        parse_result = await parse_prompt(state, self.llms["parse"], location, send_msg)
         state.update(parse_result)
         
         await send_msg({
@@ -233,14 +315,14 @@ class WorkflowExecutor:
     
     async def _clarification_loop(self, state, send_msg, location: dict = None):
         """Handle clarification questions in a loop"""
-        while state.get("clarifications_needed") and len(state["clarifications_needed"]) > 0:
+        while state.get("clarifications_needed"):
             clarification_result = await websocket_nodes.ask_clarifications_ws(state, send_msg)
             state.update(clarification_result)
             
-            process_result = process_clarifications(state, self.llm, location)
+            process_result = await process_clarifications(state, self.llms["update"], location, send_msg)
             state.update(process_result)
     
-    async def _check_smart_lists_step(self, state, send_msg, credentials: dict = None):
+    async def _check_smart_lists_step(self, state, send_msg, client_id, credentials: dict = None):
         """Check for existing smart lists"""
         if state["current_step"] in ["check_clarifications", "clarify_ambiguity"]:
             await send_msg({
@@ -262,7 +344,18 @@ class WorkflowExecutor:
                     "timestamp": asyncio.get_event_loop().time()
                 })
             
-            check_result = await websocket_nodes.fetch_and_match_smart_lists_wrapper(state, self.llm, credentials)
+            lists_result = None
+            session = self.client_sessions.get(client_id, {})
+            lists_prefetch = session.pop("lists_prefetch", None)
+            if lists_prefetch:
+                prefetched = await lists_prefetch
+                # Clarifications can take a while; don't match against an outdated catalog
+                if prefetched and time.monotonic() - prefetched[0] < SMART_LISTS_MAX_AGE:
+                    lists_result = prefetched[1]
+            
+            check_result = await websocket_nodes.fetch_and_match_smart_lists_wrapper(
+                state, self.llms["match"], credentials, lists_result
+            )
             state.update(check_result)
     
     async def _handle_smart_list_selection(self, state, send_msg, location: dict = None, credentials: dict = None):
@@ -356,7 +449,7 @@ class WorkflowExecutor:
     
     async def _generate_fredql(self, state, send_msg, location: dict = None, credentials: dict = None):
         """Generate FredQL query for new smart list"""
-        result = await websocket_nodes.generate_smart_list_fredql_ws(state, self.llm, send_msg, location, credentials)
+        result = await websocket_nodes.generate_smart_list_fredql_ws(state, self.llms["fredql"], send_msg, location, credentials)
         state.update(result)
     
     async def _create_smart_list(self, state, send_msg, credentials: dict = None):
@@ -377,7 +470,7 @@ class WorkflowExecutor:
         # Keep looping while user wants changes
         while state["current_step"] == "process_smart_list_changes":
             print(f"[Review Loop] Processing changes...")
-            change_result = await process_smart_list_changes_ws(state, self.llm, send_msg, location, credentials)
+            change_result = await process_smart_list_changes_ws(state, self.llms["fredql"], send_msg, location, credentials)
             state.update(change_result)
             print(f"[Review Loop] After processing changes, current_step: {state['current_step']}")
             
@@ -398,7 +491,10 @@ class WorkflowExecutor:
     async def _create_campaign_step(self, state, send_msg, location: dict = None, credentials: dict = None):
         """Create campaign and generate email template"""
         if state["current_step"] == "create_campaign":
-            result = await websocket_nodes.create_campaign_ws(state, self.llm, send_msg, location, credentials)
+            result = await websocket_nodes.create_campaign_ws(
+                state, self.llms["email_generation"], send_msg, location, credentials,
+                meta_llm=self.llms["email_meta"]
+            )
             state.update(result)
     
     async def _review_email_template(self, state, send_msg, location: dict = None, credentials: dict = None):
@@ -414,7 +510,7 @@ class WorkflowExecutor:
         # Keep looping while user wants changes
         while state["current_step"] == "process_email_changes":
             print(f"[Email Review Loop] Processing changes...")
-            change_result = await process_email_changes_ws(state, self.llm, send_msg, location, credentials)
+            change_result = await process_email_changes_ws(state, self.llms["email_update"], send_msg, location, credentials)
             state.update(change_result)
             print(f"[Email Review Loop] After processing changes, current_step: {state['current_step']}")
             
@@ -442,7 +538,7 @@ class WorkflowExecutor:
         
         # Keep looping while user wants changes
         while state["current_step"] == "process_schedule_changes":
-            change_result = await process_schedule_changes_ws(state, self.llm, send_msg)
+            change_result = await process_schedule_changes_ws(state, self.llms["schedule"], send_msg)
             state.update(change_result)
             
             # After processing changes, it goes back to confirm_schedule
@@ -460,9 +556,11 @@ class WorkflowExecutor:
             state.update(schedule_result)
     
     def _cleanup_client(self, client_id: str):
-        """Clean up client session and workflow"""
+        """Clean up client session"""
         if client_id in self.client_sessions:
+            for name in ("prefetch", "lists_prefetch", "generation_prefetch"):
+                task = self.client_sessions[client_id].get(name)
+                if task and not task.done():
+                    task.cancel()
             del self.client_sessions[client_id]
-        if client_id in self.client_workflows:
-            del self.client_workflows[client_id]
 
@@ -83,8 +83,11 @@ async def process_email_changes_ws(state: CampaignState, llm, send_message: Call
     })
     
     try:
-        from ..prompts import EMAIL_UPDATE_PROMPT
-        from ..utils.location_utils import format_location_context
+        from ..prompts import email_update_template_for_location
+        from ..utils.location_utils import format_location_context, format_merge_tags
+        from ..utils.llm_utils import with_prompt_cache_key, log_prompt_cache_usage
+        from ..utils.llm_cache import cached_llm_call
+        from ..utils.email_sections import find_email_section, is_section_html
         import json
         
         # Format location context
@@ -102,28 +105,8 @@ async def process_email_changes_ws(state: CampaignState, llm, send_message: Call
         merge_tags_list = state.get("merge_tags", [])
         print(f"[Email Update] Merge tags in state: {len(merge_tags_list)} tags")
         
-        merge_tag_items = []
-        for tag in merge_tags_list:
-            attrs = tag.get("attributes", {})
-            tag_value = attrs.get("merge_tag_value", "")
-            display_name = attrs.get("display_name", tag_value)
-            preview_value = attrs.get("preview_value", "")
-            hidden = attrs.get("hidden", False)
-            
-            # Skip hidden tags
-            if hidden:
-                continue
-            
-            if tag_value:
-                tag_item = f"- **{{{{{tag_value}}}}}** ({display_name})"
-                if preview_value:
-                    tag_item += f" - Example: {preview_value}"
-                merge_tag_items.append(tag_item)
-        
-        merge_tags_text = "\n".join(merge_tag_items) if merge_tag_items else "No merge tags available."
-        print(f"[Email Update] Formatted {len(merge_tag_items)} tags for LLM prompt")
-        if merge_tag_items:
-            print(f"[Email Update] First 3 merge tags:\n{chr(10).join(merge_tag_items[:3])}")
+        merge_tags_text = format_merge_tags(merge_tags_list)
+        print(f"[Email Update] First 3 merge tags:\n{chr(10).join(merge_tags_text.splitlines()[:3])}")
         print(f"[Email Update] User feedback: {user_feedback}")
         
         # Use LLM to determine if new images are needed and extract search query
@@ -131,45 +114,17 @@ async def process_email_changes_ws(state: CampaignState, llm, send_message: Call
         
         try:
             from src.utils.image_utils import get_pexels_images
-            from langchain_core.prompts import ChatPromptTemplate
-            import json
+            from ..prompts import IMAGE_ANALYSIS_PROMPT
+            from ..models import ImageAnalysis
             
             # Ask LLM to analyze if images are needed and extract query
-            image_analysis_prompt = ChatPromptTemplate.from_messages([
-                ("system", """Analyze the user's change request for an email template and determine if new images from stock photography are needed.
-
-Return a JSON response with:
-- "needs_images": true/false - Does the user want to add, change, or update images?
-- "search_query": "2-4 word query" - If needs_images is true, provide a focused search query for finding relevant stock images. If false, leave empty.
-
-Examples:
-- "change the hero image to something about yoga" → {{"needs_images": true, "search_query": "yoga class"}}
-- "add a fitness image at the top" → {{"needs_images": true, "search_query": "fitness workout"}}
-- "make the text bigger and bold" → {{"needs_images": false, "search_query": ""}}
-- "fix the grammar in the first paragraph" → {{"needs_images": false, "search_query": ""}}
-- "replace the beach photo with mountains" → {{"needs_images": true, "search_query": "mountain landscape"}}
-
-Return ONLY valid JSON, no explanations."""),
-                ("human", "User's change request: {user_request}\n\nJSON response:")
-            ])
-            
-            analysis_response = await llm.ainvoke(image_analysis_prompt.format_messages(user_request=user_feedback))
-            analysis_text = analysis_response.content.strip()
-            
-            # Clean up markdown if present
-            if analysis_text.startswith("```json"):
-                analysis_text = analysis_text[7:]
-            if analysis_text.startswith("```"):
-                analysis_text = analysis_text[3:]
-            if analysis_text.endswith("```"):
-                analysis_text = analysis_text[:-3]
-            analysis_text = analysis_text.strip()
-            
-            analysis = json.loads(analysis_text)
+            analysis = await llm.with_structured_output(ImageAnalysis).ainvoke(
+                IMAGE_ANALYSIS_PROMPT.format_messages(user_request=user_feedback)
+            )
             
-            if analysis.get("needs_images", False) and analysis.get("search_query", "").strip():
+            if analysis.needs_images and analysis.search_query.strip():
                 # User is requesting image changes - fetch new images from Pexels
-                image_query = analysis["search_query"].strip()
+                image_query = analysis.search_query.strip()
                 
                 await send_message({
                     "type": "assistant_thinking",
@@ -206,46 +161,59 @@ Return ONLY valid JSON, no explanations."""),
             print(f"[Email Update] Failed to analyze image needs or fetch images: {str(e)}")
             # Continue without new images
         
-        # Prepare prompt for LLM
+        # Prepare prompt for LLM (business name and location context are bound
+        # once per business); new Pexels images are included only if fetched
         if pexels_images_text:
-            # Include new Pexels images in the prompt
-            update_prompt = EMAIL_UPDATE_PROMPT.format_messages(
-                business_name=business_name,
-                location_context=location_context,
-                social_links=social_links_text,
-                merge_tags=merge_tags_text,
-                reference_templates=reference_templates,
-                pexels_images=f"\n\nNEW PEXELS IMAGES (use these if user requested image changes):\n{pexels_images_text}\n",
-                current_html=current_html,
-                user_feedback=user_feedback
-            )
-        else:
-            # No new images needed
-            update_prompt = EMAIL_UPDATE_PROMPT.format_messages(
-                business_name=business_name,
-                location_context=location_context,
-                social_links=social_links_text,
-                merge_tags=merge_tags_text,
-                reference_templates=reference_templates,
-                pexels_images="",
-                current_html=current_html,
-                user_feedback=user_feedback
-            )
+            pexels_images_text = f"\n\nNEW PEXELS IMAGES (use these if user requested image changes):\n{pexels_images_text}\n"
+        
+        template = email_update_template_for_location(business_name, location_context)
+        inputs = {
+            "social_links": social_links_text,
+            "merge_tags": merge_tags_text,
+            "reference_templates": reference_templates,
+            "pexels_images": pexels_images_text,
+            "current_html": current_html,
+            "user_feedback": user_feedback
+        }
         
-        # Get updated HTML from LLM
-        response = await llm.ainvoke(update_prompt)
-        response_text = response.content.strip()
+        async def update():
+            # Edits for the same business share the instructions and context prefix
+            response = await with_prompt_cache_key(
+                llm, f"email_update:{state.get('location_id')}"
+            ).ainvoke(template.format_messages(**inputs))
+            log_prompt_cache_usage("Email Update", response)
+            response_text = response.content.strip()
+            
+            # Clean up markdown if LLM added it
+            if response_text.startswith("```html"):
+                response_text = response_text[7:]  # Remove ```html
+            if response_text.startswith("```"):
+                response_text = response_text[3:]  # Remove ```
+            if response_text.endswith("```"):
+                response_text = response_text[:-3]  # Remove closing ```
+            
+            # None (not "") so an empty response isn't cached
+            return response_text.strip() or None
         
-        # Clean up markdown if LLM added it
-        if response_text.startswith("```html"):
-            response_text = response_text[7:]  # Remove ```html
-        if response_text.startswith("```"):
-            response_text = response_text[3:]  # Remove ```
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]  # Remove closing ```
-        response_text = response_text.strip()
+        # Requests about one section (greeting, signature, footer, button) send
+        # only that table row and splice the result back into the email
+        updated_html = None
+        section = None if pexels_images_text else find_email_section(current_html, user_feedback)
+        if section:
+            start, end = section
+            print(f"[Email Update] Sending only the affected section ({end - start} of {len(current_html)} chars)")
+            inputs["current_html"] = f"SECTION (the rest of the email is unchanged):\n{current_html[start:end]}"
+            updated_section = await cached_llm_call(llm, template, inputs, update, allow_sampled=True)
+            if updated_section and is_section_html(updated_section):
+                updated_html = current_html[:start] + updated_section + current_html[end:]
+            else:
+                print("[Email Update] Section edit didn't return a table row, updating the whole email")
+                inputs["current_html"] = current_html
         
-        updated_html = response_text
+        # Get updated HTML from LLM. The same request on the same HTML (a resent
+        # or repeated edit) replays the earlier result instead of a new sample
+        if updated_html is None:
+            updated_html = await cached_llm_call(llm, template, inputs, update, allow_sampled=True)
         
         if not updated_html:
             await send_message({
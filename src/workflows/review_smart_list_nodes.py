@@ -96,10 +96,10 @@ async def process_smart_list_changes_ws(state: CampaignState, llm, send_message:
     })
     
     try:
-        from ..prompts import FREDQL_GENERATION_TEMPLATE
         from ..utils.location_utils import format_location_context
         from .websocket_nodes import fetch_contact_properties_for_validation, validate_contact_properties_in_fredql
         from ..constants.interaction_types import VALID_INTERACTION_TYPES, validate_interaction_types
+        from ..utils.fredql_utils import convert_durations
         import json
         
         # Fetch contact properties for validation
@@ -173,7 +173,7 @@ If the requested changes are not possible, return:
         ])
         
         chain = update_template | llm
-        response = chain.invoke({
+        response = await chain.ainvoke({
             "location_context": location_context,
             "contact_properties": contact_properties_text
         })
@@ -231,7 +231,8 @@ If the requested changes are not possible, return:
             }
         
         # Validate the updated FredQL
-        updated_fredql = result.get("fredql_query", [])
+        # Accept durations like "7d" as well as minute values
+        updated_fredql = convert_durations(result.get("fredql_query", []))
         updated_name = result.get("display_name", current_display_name)
         updated_display = updated_name  # Initialize with the same value
         explanation = result.get("explanation", "Smart list updated")
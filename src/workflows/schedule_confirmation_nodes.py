@@ -84,31 +84,11 @@ async def process_schedule_changes_ws(state: CampaignState, llm, send_message: C
     })
     
     try:
-        from langchain_core.prompts import ChatPromptTemplate
+        from ..prompts import SCHEDULE_PARSE_PROMPT
         
-        # Create a prompt to parse the new schedule
-        schedule_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a schedule parsing assistant. 
-
-CURRENT SCHEDULE: {current_schedule}
-
-LOCATION TIMEZONE: {location_timezone}
-
-USER'S CHANGE REQUEST: {schedule_feedback}
-
-Parse the user's request and provide the updated schedule datetime.
-Return ONLY the new datetime in ISO 8601 format with timezone offset.
-
-FORMAT: YYYY-MM-DDTHH:MM:SS+TZ:TZ
-EXAMPLE: 2025-11-28T14:15:00+05:30
-
-Use the location's timezone offset from the LOCATION TIMEZONE field above.
-Return ONLY the datetime string in this exact format, no explanations or additional text."""),
-            ("human", "Parse the schedule change now.")
-        ])
         
         # Get updated schedule from LLM
-        messages = schedule_prompt.format_messages(
+        messages = SCHEDULE_PARSE_PROMPT.format_messages(
             current_schedule=current_schedule,
             schedule_feedback=schedule_feedback,
             location_timezone=location_timezone
@@ -2,10 +2,13 @@
 WebSocket-aware workflow nodes that communicate via WebSocket instead of terminal input
 """
 
+import os
 import asyncio
+from functools import lru_cache
 from typing import Dict, Any, Callable
-from ..models import CampaignState
-from ..nodes import fetch_and_match_smart_lists as _fetch_and_match_smart_lists
+from ..models import CampaignState, EmailMetaResult
+from ..utils.email_style import style_fingerprint, compact_html
+from ..nodes import fetch_and_match_smart_lists as _fetch_and_match_smart_lists, format_clarification
 
 
 # Global storage for pending responses
@@ -15,7 +18,8 @@ pending_responses: Dict[str, asyncio.Future] = {}
 async def ask_clarifications_ws(state: CampaignState, send_message: Callable) -> dict:
     """
     WebSocket version of ask_clarifications.
-    Sends questions via WebSocket and waits for responses.
+    Sends all questions as one numbered message via WebSocket and waits for
+    a single response covering them.
     """
     await send_message({
         "type": "system",
@@ -26,29 +30,41 @@ async def ask_clarifications_ws(state: CampaignState, send_message: Callable) ->
     clarification_responses = state.get("clarification_responses", {})
     questions_to_ask = state["clarifications_needed"][:5]
     
-    # Send each question
-    for i, question in enumerate(questions_to_ask, 1):
-        question_id = f"clarification_{i}"
-        
-        await send_message({
-            "type": "question",
-            "message": question,
-            "question_id": question_id,
-            "question_number": i,
-            "total_questions": len(questions_to_ask),
-            "timestamp": asyncio.get_event_loop().time()
-        })
-        
-        # Wait for response
-        loop = asyncio.get_running_loop()
-        future = loop.create_future()
-        pending_responses[question_id] = future
-        
-        response = await future
-        clarification_responses[question] = response or "Not specified - please use best judgment"
+    # Ask everything in one message so the user answers in a single turn
+    if len(questions_to_ask) == 1:
+        question = questions_to_ask[0]
+    else:
+        question = "\n".join(f"{i}. {q}" for i, q in enumerate(questions_to_ask, 1))
+    question_id = "clarification_1"
+    
+    # Register before sending so a fast reply can't arrive unclaimed
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    pending_responses[question_id] = future
+    
+    await send_message({
+        "type": "question",
+        "message": question,
+        "question_id": question_id,
+        "question_number": 1,
+        "total_questions": 1,
+        "timestamp": asyncio.get_event_loop().time()
+    })
+    
+    # Wait for response
+    response = await future
+    answer = response or "Not specified - please use best judgment"
+    clarification_responses[question] = answer
+    
+    # Append this round to the prompt context instead of re-rendering every round
+    clarification_context = state.get("clarification_context", "")
+    if clarification_context:
+        clarification_context += "\n"
+    clarification_context += format_clarification(question, answer)
     
     return {
         "clarification_responses": clarification_responses,
+        "clarification_context": clarification_context,
         "current_step": "process_clarifications"
     }
 
@@ -218,11 +234,30 @@ def set_response(question_id: str, response: str):
         del pending_responses[question_id]
 
 
-async def fetch_and_match_smart_lists_wrapper(state: CampaignState, llm, credentials: dict = None) -> dict:
+async def fetch_and_match_smart_lists_wrapper(state: CampaignState, llm, credentials: dict = None, lists_result: dict = None) -> dict:
     """
     Wrapper for fetch_and_match_smart_lists that can be used in LangGraph workflow
     """
-    return await _fetch_and_match_smart_lists(state, llm, credentials)
+    return await _fetch_and_match_smart_lists(state, llm, credentials, lists_result)
+
+
+def _canonical_names(names) -> tuple:
+    """Deduplicate, trim and sort names so a location's schema always serializes the same way"""
+    return tuple(sorted({str(name).strip() for name in names if name and str(name).strip()}))
+
+
+@lru_cache(maxsize=256)
+def _format_names(names: tuple, bullet: str) -> str:
+    """Render canonical names as a bullet list for the FredQL prompt (cached per schema)"""
+    return "\n".join(f"{bullet}{name}" for name in names)
+
+
+# Used when a location's contact properties can't be fetched
+FALLBACK_CONTACT_PROPERTIES = _canonical_names([
+    "first_name", "last_name", "email", "mobile_phone_number",
+    "city", "state", "postal_code", "country", "birth_date", "gender",
+    "marketing_email_subscribed", "marketing_text_message_subscribed", "active_membership"
+])
 
 
 async def fetch_contact_properties_for_validation(location_id: str, credentials: dict = None) -> tuple[bool, list[str], str]:
@@ -251,17 +286,15 @@ async def fetch_contact_properties_for_validation(location_id: str, credentials:
             return False, [], ""
         
         # Extract property names
-        property_names = []
-        for prop in result.get("data", []):
-            attrs = prop.get("attributes", {})
-            prop_name = attrs.get("name")
-            if prop_name:
-                property_names.append(prop_name)
+        property_names = _canonical_names(
+            prop.get("attributes", {}).get("name")
+            for prop in result.get("data", [])
+        )
         
         # Format for prompt
-        formatted = "\n".join([f"  - {name}" for name in sorted(property_names)])
+        formatted = _format_names(property_names, "  - ")
         
-        return True, property_names, formatted
+        return True, list(property_names), formatted
     except Exception as e:
         return False, [], ""
 
@@ -301,17 +334,14 @@ async def fetch_and_merge_interaction_types(location_id: str, credentials: dict
                     all_types.add(type_name)
         
         # Convert to sorted list
-        merged_types = sorted(list(all_types))
+        merged_types = _canonical_names(all_types)
         
         # Format for prompt (bullet list like contact properties)
-        formatted = "\n".join([f"- {type_name}" for type_name in merged_types])
-        
-        return True, merged_types, formatted
+        return True, list(merged_types), _format_names(merged_types, "- ")
     except Exception as e:
         # If fetch fails, use hardcoded defaults
-        merged_types = sorted(list(all_types))
-        formatted = "\n".join([f"- {type_name}" for type_name in merged_types])
-        return True, merged_types, formatted
+        merged_types = _canonical_names(all_types)
+        return True, list(merged_types), _format_names(merged_types, "- ")
 
 
 def validate_contact_properties_in_fredql(fredql_query: dict, valid_properties: list[str]) -> tuple[bool, list[str]]:
@@ -386,24 +416,8 @@ async def generate_smart_list_fredql_ws(state: CampaignState, llm, send_message:
     
     if not success or not valid_properties:
         # Use common fallback properties if fetch fails
-        formatted_properties = """  - first_name
-  - last_name
-  - email
-  - mobile_phone_number
-  - city
-  - state
-  - postal_code
-  - country
-  - birth_date
-  - gender
-  - marketing_email_subscribed
-  - active_membership
-  - marketing_text_message_subscribed"""
-        valid_properties = [
-            "first_name", "last_name", "email", "mobile_phone_number",
-            "city", "state", "postal_code", "country", "birth_date", "gender",
-            "marketing_email_subscribed", "marketing_text_message_subscribed", "active_membership"
-        ]
+        formatted_properties = _format_names(FALLBACK_CONTACT_PROPERTIES, "  - ")
+        valid_properties = list(FALLBACK_CONTACT_PROPERTIES)
     
     # Fetch and merge interaction types
     _, merged_interaction_types, formatted_interaction_types = await fetch_and_merge_interaction_types(location_id, credentials)
@@ -416,7 +430,10 @@ async def generate_smart_list_fredql_ws(state: CampaignState, llm, send_message:
     })
     
     try:
-        from ..prompts import FREDQL_GENERATION_TEMPLATE
+        from ..prompts import fredql_template_for_location
+        from ..utils.llm_cache import cached_llm_call
+        from ..utils.llm_utils import with_prompt_cache_key, log_prompt_cache_usage
+        from ..utils.fredql_utils import convert_durations
         from ..utils.location_utils import format_location_context
         from ..constants.interaction_types import validate_interaction_types
         import json
@@ -428,19 +445,24 @@ async def generate_smart_list_fredql_ws(state: CampaignState, llm, send_message:
         contact_properties_text = formatted_properties if formatted_properties else "Contact properties not available - proceed with caution"
         
         # Generate FredQL using LLM
-        chain = FREDQL_GENERATION_TEMPLATE | llm
-        response = chain.invoke({
+        # Interaction types and contact properties are bound once per location
+        # (and the location's requests share a provider prompt cache)
+        template = fredql_template_for_location(
+            location_id, formatted_interaction_types, contact_properties_text
+        )
+        chain = template | with_prompt_cache_key(llm, f"fredql:{location_id}")
+        inputs = {
             "audience_description": audience_description,
-            "location_context": location_context,
-            "contact_properties": contact_properties_text,
-            "interaction_types": formatted_interaction_types
-        })
-        
-        # Extract FredQL from response
-        fredql_text = response.content.strip()
+            "location_context": location_context
+        }
         
-        # Try to parse as JSON to validate
-        try:
+        async def generate():
+            response = await chain.ainvoke(inputs)
+            log_prompt_cache_usage("FredQL", response)
+            
+            # Extract FredQL from response
+            fredql_text = response.content.strip()
+            
             # Remove markdown code blocks if present
             if fredql_text.startswith("```"):
                 fredql_text = fredql_text.split("```")[1]
@@ -448,7 +470,13 @@ async def generate_smart_list_fredql_ws(state: CampaignState, llm, send_message:
                     fredql_text = fredql_text[4:]
                 fredql_text = fredql_text.strip()
             
-            fredql_result = json.loads(fredql_text)
+            # Parsed here so only valid JSON is cached
+            return json.loads(fredql_text)
+        
+        # Try to parse as JSON to validate
+        try:
+            # Same audience, location and schema -> same rendered prompt -> cache hit
+            fredql_result = await cached_llm_call(llm, template, inputs, generate)
             
             # Check for error response
             if isinstance(fredql_result, dict) and "error" in fredql_result:
@@ -473,6 +501,9 @@ async def generate_smart_list_fredql_ws(state: CampaignState, llm, send_message:
                 fredql_query = fredql_result
                 generated_smart_list_name = ""
             
+            # The prompt asks for durations like "7d"; FredQL expects minutes
+            fredql_query = convert_durations(fredql_query)
+            
             # Validate interaction types in the generated FredQL (log warnings only)
             is_valid, invalid_types = validate_interaction_types(fredql_query)
             if not is_valid:
@@ -604,7 +635,10 @@ async def handle_manual_list_name_ws(state: CampaignState, send_message: Callabl
         
         try:
             from src.mcp.contacts_mcp import get_existing_smart_lists
+            from src.mcp.response_cache import invalidate
             
+            # The list was just created in the UI, so skip any cached catalog
+            invalidate(location_id, tool="get_existing_smart_lists")
             result = await get_existing_smart_lists(
                 location_id,
                 api_key=credentials.get("api_key"),
@@ -986,7 +1020,92 @@ async def create_smart_list_ws(state: CampaignState, send_message: Callable, cre
         }
 
 
-async def create_campaign_ws(state: CampaignState, llm, send_message: Callable, location: dict = None, credentials: dict = None) -> dict:
+# Minimum seconds between partial email previews sent to the client
+EMAIL_PREVIEW_INTERVAL = 0.3
+
+# Reference emails sent to the LLM as full HTML; later ones are summarized
+REFERENCE_TEMPLATES_RAW = int(os.getenv("REFERENCE_TEMPLATES_RAW", "1"))
+
+
+async def _stream_email_generation(llm, messages: list, send_message: Callable) -> str:
+    """
+    Stream the email HTML (generated as raw text, not a JSON string, so quotes
+    and newlines aren't escaped), forwarding the partial HTML to the client as
+    it arrives.
+    
+    Args:
+        llm: Language model instance
+        messages: Formatted EMAIL_TEMPLATE_GENERATION_PROMPT messages
+        send_message: Async function to send messages via WebSocket
+        
+    Returns:
+        The generated HTML (empty string if nothing was generated)
+    """
+    from src.utils.llm_utils import log_prompt_cache_usage
+    
+    loop = asyncio.get_running_loop()
+    chunks = []
+    last_preview = loop.time()
+    
+    async for chunk in llm.astream(messages):
+        # Usage arrives on its own (final) chunk
+        log_prompt_cache_usage("Email Generation", chunk)
+        if not chunk.content:
+            continue
+        chunks.append(chunk.content)
+        
+        now = loop.time()
+        if now - last_preview < EMAIL_PREVIEW_INTERVAL:
+            continue
+        last_preview = now
+        
+        await send_message({
+            "type": "partial",
+            "delta": {"html": "".join(chunks)},
+            "timestamp": now,
+            "disable_input": True
+        })
+    
+    html = "".join(chunks).strip()
+    
+    # Clean up markdown if LLM added it
+    if html.startswith("```html"):
+        html = html[7:]  # Remove ```html
+    if html.startswith("```"):
+        html = html[3:]  # Remove ```
+    if html.endswith("```"):
+        html = html[:-3]  # Remove closing ```
+    return html.strip()
+
+
+async def _generate_email_meta(llm, business_name: str, campaign_description: str, recent_subject_lines: list[str]) -> EmailMetaResult | None:
+    """
+    Generate the campaign name and subject line (run alongside the HTML stream).
+    
+    Args:
+        llm: Language model instance
+        business_name: Business name
+        campaign_description: Campaign brief
+        recent_subject_lines: Subject lines of the business's latest emails, for tone
+        
+    Returns:
+        EmailMetaResult, or None if generation failed (defaults are used instead)
+    """
+    from src.prompts import EMAIL_META_PROMPT
+    
+    try:
+        messages = EMAIL_META_PROMPT.format_messages(
+            business_name=business_name,
+            campaign_description=campaign_description,
+            recent_subject_lines="\n".join(f"- {line}" for line in recent_subject_lines) or "None available"
+        )
+        return await llm.with_structured_output(EmailMetaResult).ainvoke(messages)
+    except Exception as e:
+        print(f"✗ Error generating campaign name and subject line: {str(e)}")
+        return None
+
+
+async def create_campaign_ws(state: CampaignState, llm, send_message: Callable, location: dict = None, credentials: dict = None, meta_llm=None) -> dict:
     """
     Create campaign and generate email template
     
@@ -996,6 +1115,7 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
         send_message: Function to send messages via WebSocket
         location: Location context with source platform information
         credentials: API credentials from client
+        meta_llm: Language model for the campaign name and subject line (defaults to llm)
     
     Returns:
         Updated state with campaign ID and email template
@@ -1008,18 +1128,22 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
         
         credentials = credentials or {}
         
-        # Step 1: Fetch social profile links
-        from src.mcp.campaigns_mcp import get_social_profile_links
+        # Step 1: Fetch social links, reference emails and merge tags concurrently
+        await send_message({
+            "type": "assistant_thinking",
+            "message": "Looking at your existing campaign emails...",
+            "timestamp": asyncio.get_event_loop().time(),
+            "disable_input": True
+        })
         
-        # Extract source platform information from location
-        source_platform = location.get("source_platform", "")
-        source_location_id = location.get("source_location_id", "")
-        source_customer_id = location.get("source_customer_id", "")
+        from src.mcp.campaigns_mcp import fetch_location_context
         
-        social_links_result = await get_social_profile_links(
-            source_platform=source_platform,
-            source_location_id=source_location_id,
-            source_customer_id=source_customer_id,
+        social_links_result, emails_result, merge_tags_result = await fetch_location_context(
+            location_id,
+            # Source platform information from location
+            source_platform=location.get("source_platform", ""),
+            source_location_id=location.get("source_location_id", ""),
+            source_customer_id=location.get("source_customer_id", ""),
             api_key=credentials.get("api_key"),
             bearer_token=credentials.get("bearer_token"),
             api_url=credentials.get("api_url")
@@ -1037,33 +1161,10 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
             social_links_data = social_links_result.get("data", [])
         
         # Format social links (only include valid URLs)
-        social_links_formatted = []
-        for link in social_links_data:
-            attrs = link.get("attributes", {})
-            platform = attrs.get("platform", "")
-            url = attrs.get("url", "")
-            if url:
-                social_links_formatted.append(f"- {platform}: {url}")
-        
-        social_links_text = "\n".join(social_links_formatted) if social_links_formatted else "No social profile links available"
-        
-        # Step 2: Fetch latest campaign emails
-        await send_message({
-            "type": "assistant_thinking",
-            "message": "Looking at your existing campaign emails...",
-            "timestamp": asyncio.get_event_loop().time(),
-            "disable_input": True
-        })
-        
-        from src.mcp.campaigns_mcp import get_latest_campaign_emails
-        
-        emails_result = await get_latest_campaign_emails(
-            location_id,
-            api_key=credentials.get("api_key"),
-            bearer_token=credentials.get("bearer_token"),
-            api_url=credentials.get("api_url")
-        )
+        from src.utils.location_utils import format_social_links, format_merge_tags
+        social_links_text = format_social_links(social_links_data)
         
+        # Step 2: Format latest campaign emails
         if "error" in emails_result:
             await send_message({
                 "type": "system",
@@ -1071,11 +1172,20 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
                 "timestamp": asyncio.get_event_loop().time(),
                 "disable_input": False
             })
-            reference_templates = "No reference templates available. Create a clean, professional email template."
+            template_texts = []
+            recent_subject_lines = []
         else:
             htmls_data = emails_result.get("htmls", [])
+            recent_subject_lines = [email["subject_line"] for email in htmls_data if email.get("subject_line")]
             
-            # Format reference templates
+            # Format reference templates (kept in API order, so the same
+            # latest emails always produce the same messages). Only the first
+            # REFERENCE_TEMPLATES_RAW are sent as full (minified) HTML; the
+            # rest as a compact style fingerprint (colors, fonts, images, layout)
+            raw_htmls = [
+                compact_html(email["html"])
+                for email in htmls_data if email.get("html")
+            ][:REFERENCE_TEMPLATES_RAW]
             template_texts = []
             for idx, email in enumerate(htmls_data, 1):
                 html = email.get("html", "")
@@ -1086,28 +1196,17 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
                     template_section = f"### Template {idx}: {campaign_name}\n"
                     if subject_line:
                         template_section += f"**Subject Line:** {subject_line}\n"
-                    template_section += f"```html\n{html}\n```\n"
+                    if len(template_texts) < REFERENCE_TEMPLATES_RAW:
+                        template_section += f"```html\n{raw_htmls[len(template_texts)]}\n```\n"
+                    else:
+                        template_section += f"**Style fingerprint:** {style_fingerprint(html)}\n"
                     template_texts.append(template_section)
-            
-            reference_templates = "\n\n".join(template_texts) if template_texts else "No reference templates available. Create a clean, professional email template."
-        
-        # Step 3: Fetch merge tags for personalization
-        await send_message({
-            "type": "assistant_thinking",
-            "message": "Fetching dynamic tags for personalization...",
-            "timestamp": asyncio.get_event_loop().time(),
-            "disable_input": True
-        })
         
-        from src.mcp.campaigns_mcp import get_merge_tags
-        
-        merge_tags_result = await get_merge_tags(
-            location_id,
-            api_key=credentials.get("api_key"),
-            bearer_token=credentials.get("bearer_token"),
-            api_url=credentials.get("api_url")
-        )
+        if not template_texts:
+            template_texts = ["No reference templates available. Create a clean, professional email template."]
+        reference_templates = "\n\n".join(template_texts)
         
+        # Step 3: Format merge tags for personalization
         if "error" in merge_tags_result:
             merge_tags_list = []
             merge_tags_text = "No merge tags available. Do not use any personalization tags."
@@ -1119,26 +1218,7 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
             print(f"[Merge Tags] Fetched {len(merge_tags_data)} merge tags")
             
             # Format merge tags for prompt
-            merge_tag_items = []
-            for tag in merge_tags_data:
-                attrs = tag.get("attributes", {})
-                tag_value = attrs.get("merge_tag_value", "")
-                display_name = attrs.get("display_name", tag_value)
-                preview_value = attrs.get("preview_value", "")
-                hidden = attrs.get("hidden", False)
-                
-                # Skip hidden tags
-                if hidden:
-                    continue
-                
-                if tag_value:
-                    tag_item = f"- **{{{{{tag_value}}}}}** ({display_name})"
-                    if preview_value:
-                        tag_item += f" - Example: {preview_value}"
-                    merge_tag_items.append(tag_item)
-            
-            merge_tags_text = "\n".join(merge_tag_items) if merge_tag_items else "No merge tags available. Do not use any personalization tags."
-            print(f"[Merge Tags] Formatted {len(merge_tag_items)} tags for prompt")
+            merge_tags_text = format_merge_tags(merge_tags_data)
         
         # Step 4: Fetch relevant images from Pexels
         await send_message({
@@ -1151,7 +1231,7 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
         # Wrap image fetching in try-except to ensure it never breaks campaign creation
         images_text = "No images available. Use existing images from reference templates if available."
         try:
-            from src.utils.image_utils import get_pexels_images
+            from src.utils.image_utils import get_cached_pexels_images
             
             # Use LLM-generated image search queries from state
             image_search_queries = state.get("image_search_queries", [])
@@ -1164,7 +1244,7 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
                 image_search_query = "business professional"
             
             # Fetch 2-3 relevant images from Pexels using the focused query
-            pexels_result = await get_pexels_images(
+            pexels_result = await get_cached_pexels_images(
                 query=image_search_query,
                 count=3
             )
@@ -1205,7 +1285,9 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
         })
         
         from src.prompts import EMAIL_TEMPLATE_GENERATION_PROMPT
+        from langchain_core.messages import HumanMessage
         from src.utils.location_utils import format_location_context
+        from src.utils.llm_utils import with_prompt_cache_key
         
         location_context = format_location_context(location)
         business_name = location.get("name", "Our Business")
@@ -1216,64 +1298,53 @@ async def create_campaign_ws(state: CampaignState, llm, send_message: Callable,
             location_context=location_context,
             social_links=social_links_text,
             campaign_description=campaign_description,
-            reference_templates=reference_templates,
+            # One message per reference template
+            reference_templates=[
+                HumanMessage(content=f"REFERENCE TEMPLATE:\n{text}") for text in template_texts
+            ],
             pexels_images=images_text,
             merge_tags=merge_tags_text
         )
         
-        # Generate email template, subject line, and campaign name
-        response = await llm.ainvoke(email_prompt)
-        response_text = response.content.strip()
+        # Warm the Frederick connection while the LLM generates, so the
+        # create campaign/email document POSTs don't pay the handshake
+        from src.mcp.http_client import prewarm
+        prewarm_task = asyncio.create_task(prewarm(credentials.get("api_url")))
+        
+        # Generate the email HTML and, concurrently, the (much shorter) campaign
+        # name and subject line, so they don't add to the HTML decode time
+        meta, email_html, _ = await asyncio.gather(
+            _generate_email_meta(meta_llm or llm, business_name, campaign_description, recent_subject_lines),
+            # Same business -> same reference templates prefix -> provider cache hit
+            _stream_email_generation(with_prompt_cache_key(llm, f"email:{location_id}"), email_prompt, send_message),
+            prewarm_task
+        )
         
-        # Clean up markdown if LLM added it
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]  # Remove ```json
-        if response_text.startswith("```"):
-            response_text = response_text[3:]  # Remove ```
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]  # Remove closing ```
-        response_text = response_text.strip()
+        campaign_name = meta.campaign_name if meta else ""
+        subject_line = meta.subject_line if meta else ""
         
-        # Parse JSON response
-        import json
-        try:
-            email_data = json.loads(response_text)
-            campaign_name = email_data.get("campaign_name", "")
-            subject_line = email_data.get("subject_line", "")
-            email_html = email_data.get("html", "")
-            
-            # Remove any merge tags from campaign name and subject line (safety measure)
-            import re
-            if campaign_name:
-                campaign_name = re.sub(r'\{\{[^}]+\}\}', '', campaign_name).strip()
-            if subject_line:
-                subject_line = re.sub(r'\{\{[^}]+\}\}', '', subject_line).strip()
-            
-            # Ensure campaign name starts with "AI - "
-            if campaign_name and not campaign_name.startswith("AI - "):
-                campaign_name = f"AI - {campaign_name}"
-            
-            # Fallback to defaults if any field is missing
-            if not campaign_name:
-                from datetime import datetime
-                campaign_name = f"AI - {smart_list_name.replace('AI - ', '')} - {datetime.now().strftime('%b %d, %Y at %I:%M %p')}"
-            if not subject_line:
-                subject_line = f"News from {business_name}"
-            
-            if not email_html:
-                await send_message({
-                    "type": "error",
-                    "message": "Failed to generate email template. Please try again.",
-                    "timestamp": asyncio.get_event_loop().time(),
-                    "disable_input": False
-                })
-                return {
-                    "current_step": "cancelled"
-                }
-        except json.JSONDecodeError as e:
+        # Remove any merge tags from campaign name and subject line (safety measure)
+        import re
+        if campaign_name:
+            campaign_name = re.sub(r'\{\{[^}]+\}\}', '', campaign_name).strip()
+        if subject_line:
+            subject_line = re.sub(r'\{\{[^}]+\}\}', '', subject_line).strip()
+        
+        # Ensure campaign name starts with "AI - "
+        if campaign_name and not campaign_name.startswith("AI - "):
+            campaign_name = f"AI - {campaign_name}"
+        
+        # Fallback to defaults if any field is missing
+        if not campaign_name:
+            from datetime import datetime
+            campaign_name = f"AI - {smart_list_name.replace('AI - ', '')} - {datetime.now().strftime('%b %d, %Y at %I:%M %p')}"
+        if not subject_line:
+            subject_line = f"News from {business_name}"
+        
+        if not email_html:
             await send_message({
                 "type": "error",
-                "message": "Failed to parse email template response. Please try again.",
+                "message": "Failed to generate email template. Please try again.",
                 "timestamp": asyncio.get_event_loop().time(),
                 "disable_input": False
             })
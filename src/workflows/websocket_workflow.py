@@ -2,6 +2,7 @@
 WebSocket-compatible LangGraph workflow with checkpointing for campaign generation
 """
 
+from functools import partial
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from ..models import CampaignState
@@ -27,76 +28,80 @@ def build_websocket_workflow(llm, send_message):
     """
     workflow = StateGraph(CampaignState)
     
-    # Add nodes - mix of sync LLM nodes and async WebSocket nodes
-    workflow.add_node("parse_prompt", lambda state: parse_prompt(state, llm))
+    # Add nodes - all nodes are async and stream or send via WebSocket.
+    # Bound with partial (not lambdas) so LangGraph sees coroutine functions
+    # and awaits them on the running event loop.
+    workflow.add_node(
+        "parse_prompt",
+        partial(parse_prompt, llm=llm, send_message=send_message)
+    )
     workflow.add_node(
         "ask_clarifications", 
-        lambda state: websocket_nodes.ask_clarifications_ws(state, send_message)
+        partial(websocket_nodes.ask_clarifications_ws, send_message=send_message)
+    )
+    workflow.add_node(
+        "process_clarifications",
+        partial(process_clarifications, llm=llm, send_message=send_message)
     )
-    workflow.add_node("process_clarifications", lambda state: process_clarifications(state, llm))
     workflow.add_node(
         "check_smart_lists", 
-        lambda state: websocket_nodes.fetch_and_match_smart_lists_wrapper(state, llm)
+        partial(websocket_nodes.fetch_and_match_smart_lists_wrapper, llm=llm)
     )
     workflow.add_node(
         "confirm_smart_list_selection",
-        lambda state: websocket_nodes.confirm_smart_list_selection_ws(state, send_message)
+        partial(websocket_nodes.confirm_smart_list_selection_ws, send_message=send_message)
     )
     workflow.add_node(
         "confirm_new_list",
-        lambda state: websocket_nodes.confirm_new_list_ws(state, send_message)
+        partial(websocket_nodes.confirm_new_list_ws, send_message=send_message)
     )
     workflow.add_node(
         "generate_fredql",
-        lambda state: websocket_nodes.generate_smart_list_fredql_ws(state, llm, send_message)
+        partial(websocket_nodes.generate_smart_list_fredql_ws, llm=llm, send_message=send_message)
     )
     workflow.add_node(
         "create_smart_list",
-        lambda state: websocket_nodes.create_smart_list_ws(state, send_message)
+        partial(websocket_nodes.create_smart_list_ws, send_message=send_message)
     )
     workflow.add_node(
         "retry_smart_list_creation",
-        lambda state: retry_smart_list_nodes.retry_smart_list_creation_ws(state, send_message)
+        partial(retry_smart_list_nodes.retry_smart_list_creation_ws, send_message=send_message)
     )
     workflow.add_node(
         "handle_manual_list_name",
-        lambda state: websocket_nodes.handle_manual_list_name_ws(state, send_message)
+        partial(websocket_nodes.handle_manual_list_name_ws, send_message=send_message)
     )
     workflow.add_node(
         "review_smart_list",
-        lambda state: review_smart_list_nodes.ask_for_review_ws(state, send_message)
+        partial(review_smart_list_nodes.ask_for_review_ws, send_message=send_message)
     )
     workflow.add_node(
         "process_smart_list_changes",
-        lambda state: review_smart_list_nodes.process_smart_list_changes_ws(state, llm, send_message)
+        partial(review_smart_list_nodes.process_smart_list_changes_ws, llm=llm, send_message=send_message)
     )
     workflow.add_node(
         "create_campaign",
-        lambda state: websocket_nodes.create_campaign_ws(
-            state, llm, send_message, 
-            location=state.get("location", {}),
-            credentials=None  # Credentials not stored in state, passed separately by executor
-        )
+        partial(websocket_nodes.create_campaign_ws, llm=llm, send_message=send_message)
     )
     workflow.add_node(
         "review_email_template",
-        lambda state: review_email_template_nodes.ask_for_email_review_ws(state, send_message)
+        partial(review_email_template_nodes.ask_for_email_review_ws, send_message=send_message)
     )
     workflow.add_node(
         "process_email_changes",
-        lambda state: review_email_template_nodes.process_email_changes_ws(state, llm, send_message)
+        partial(review_email_template_nodes.process_email_changes_ws, llm=llm, send_message=send_message)
     )
     workflow.add_node(
         "confirm_schedule",
-        lambda state: schedule_confirmation_nodes.confirm_schedule_ws(state, send_message)
+        partial(schedule_confirmation_nodes.confirm_schedule_ws, send_message=send_message)
     )
     workflow.add_node(
         "process_schedule_changes",
-        lambda state: schedule_confirmation_nodes.process_schedule_changes_ws(state, llm, send_message)
+        partial(schedule_confirmation_nodes.process_schedule_changes_ws, llm=llm, send_message=send_message)
     )
     workflow.add_node(
         "schedule_campaign",
-        lambda state: schedule_confirmation_nodes.schedule_campaign_ws(state, send_message)
+        partial(schedule_confirmation_nodes.schedule_campaign_ws, send_message=send_message)
     )
     
     # Set entry point